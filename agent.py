@@ -4,6 +4,8 @@ import argparse
 import logging
 import os
 import openai
+from crawl4ai.output.shards import is_shard_file, iter_shard_records
+from crawl4ai.utils.simhash import SimHashIndex, simhash
 
 # Set up logging for debugging and error tracking.
 logging.basicConfig(level=logging.INFO)
@@ -73,8 +75,8 @@ def summarize_website(pages: dict) -> str:
 
 def read_markdown_files(folder: str) -> dict:
     """
-    Reads all markdown (*.md) files from the provided folder and returns a dictionary
-    mapping file names to their content.
+    Reads all markdown (*.md) files and JSONL crawl shards from the provided folder
+    and returns a dictionary mapping file names (or page URLs, for shards) to their content.
     """
     folder_path = Path(folder)
     if not folder_path.is_dir():
@@ -88,6 +90,27 @@ def read_markdown_files(folder: str) -> dict:
             logger.info(f"Loaded {md_file.name}")
         except Exception as e:
             logger.error(f"Error reading {md_file.name}: {e}")
+
+    # Pages saved with output_format="jsonl" are streamed from their shards
+    if any(is_shard_file(path) for path in folder_path.iterdir()):
+        count = len(pages)
+        for record in iter_shard_records(folder_path):
+            pages[record["url"]] = record["markdown"]
+        logger.info(f"Loaded {len(pages) - count} pages from JSONL shards")
+
+    # Pages that differ only in timestamps or ad slots are summarized once
+    index = SimHashIndex()
+    kept = []  # Page names by index id
+    for name in list(pages):
+        fingerprint = simhash(pages[name])
+        if not fingerprint:
+            continue
+        match = index.check(fingerprint)
+        if match is None:
+            kept.append(name)
+        else:
+            logger.info(f"Skipping {name}: near duplicate of {kept[match]}")
+            del pages[name]
     return pages
 
 def main():
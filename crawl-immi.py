@@ -2,6 +2,7 @@ import asyncio
 from crawl4ai import *
 from pathlib import Path
 from datetime import datetime
+from crawl4ai.output import MarkdownFileWriter
 
 # Constants for configuration
 URLS_TO_CRAWL = [
@@ -21,7 +22,7 @@ async def main():
     # Generate timestamp for this batch
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    async with AsyncWebCrawler() as crawler:
+    async with AsyncWebCrawler() as crawler, MarkdownFileWriter() as writer:
         for index, url in enumerate(URLS_TO_CRAWL, start=1):
             try:
                 # Create numbered filename using index
@@ -32,8 +33,8 @@ async def main():
                 # Clean up the markdown before saving
                 cleaned_markdown = result.clean_markdown()
                 
-                # Write the cleaned markdown content to file
-                output_file.write_text(cleaned_markdown)
+                # Queue the cleaned markdown for the background writer
+                await writer.write_file(output_file, cleaned_markdown)
                 print(f"Content from {url} saved to: {output_file}")
                 
             except Exception as e:
@@ -2,7 +2,8 @@ import asyncio
 from pathlib import Path
 from datetime import datetime
 import sys
-from crawl4ai import AsyncWebCrawler
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.output import MarkdownFileWriter
 from crawl4ai.utils.filename import generate_filename
 
 # Constants for configuration
@@ -24,6 +25,10 @@ URLS_TO_CRAWL = [
 ]
 OUTPUT_FILE_PREFIX = "abc"  # Default prefix for files
 
+# Cache Configuration: each run sends If-None-Match/If-Modified-Since and
+# reuses the cached markdown for pages the server reports unchanged
+CRAWL_CONFIG = CrawlerRunConfig(cache_mode=CacheMode.REVALIDATE, cache_dir="output/.cache")
+
 async def main():
     try:
         # Create main output directory
@@ -37,7 +42,7 @@ async def main():
         # Generate timestamp for this batch
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        async with AsyncWebCrawler() as crawler:
+        async with AsyncWebCrawler(run_config=CRAWL_CONFIG) as crawler, MarkdownFileWriter() as writer:
             for index, url in enumerate(URLS_TO_CRAWL, start=1):
                 try:
                     print(f"\nProcessing {index}/{len(URLS_TO_CRAWL)}: {url}")
@@ -51,9 +56,10 @@ async def main():
                         filename = generate_filename(url, index, timestamp, OUTPUT_FILE_PREFIX)
                         output_file = output_dir / filename
                         
-                        # Write the cleaned markdown content to file
-                        output_file.write_text(cleaned_markdown)
-                        print(f"✓ Successfully saved to: {output_file}")
+                        # Queue the cleaned markdown for the background writer
+                        await writer.write_file(output_file, cleaned_markdown)
+                        status = "Not modified" if result.not_modified else "Successfully crawled"
+                        print(f"✓ {status}, saving to: {output_file}")
                     else:
                         print("✗ Failed: No content retrieved")
                         
@@ -1,7 +1,11 @@
 import asyncio
 import sys
 from crawl4ai.crawlers.sitemap import SitemapCrawler
-from crawl4ai.crawlers.sequential import crawl_sequential
+from crawl4ai.crawlers.async_sitemap import AsyncSitemapCrawler
+from crawl4ai.crawlers.pipeline import stream_urls
+from crawl4ai.crawlers.sequential import CrawlJobConfig, crawl_sequential
+from crawl4ai.crawlers.incremental import CrawlStateStore
+from crawl4ai.crawlers.journal import CrawlJournal
 
 # Constants for configuration
 # BASE_URL = "https://docs.crawl4ai.com"
@@ -15,12 +19,54 @@ CUSTOM_SITEMAP_URL = "https://vaea.vic.gov.au/sitemap.xml"
 MAIN_SITEMAP_URL = "https://vaea.vic.gov.au/sitemap.xml"
 USE_CUSTOM_SITEMAP_ONLY = False  # Set to True to only use custom sitemap
 
+# Incremental Configuration
+INCREMENTAL_CRAWL = True  # Only crawl pages whose <lastmod> changed since the last run
+CRAWL_STATE_DB = "output/crawl_state.db"
+
+# Resume Configuration
+CRAWL_JOURNAL = "output/crawl_journal.db"  # Resume interrupted runs from here, None to disable
+
+# Streaming Configuration
+STREAM_DISCOVERY = False  # Start crawling while sitemaps are still being parsed (no confirmation prompt)
+
 # Output Configuration
-# defined in sequential.py
+JOB_CONFIG = CrawlJobConfig(
+    output_dir="output",
+    prefix="vaea",
+    max_pages_to_save=None,  # None for unlimited; crawling stops once reached
+    concurrency=4,  # Pages fetched at once (at most 2 per host by default)
+)
+
+async def discover_urls(state_store: CrawlStateStore = None):
+    """Yield sitemap URLs as they are parsed, skipping unchanged pages."""
+    if CUSTOM_SITEMAP_URL:
+        async with AsyncSitemapCrawler(BASE_URL) as sitemap_crawler:
+            async for entry in sitemap_crawler.iter_entries_from_sitemap(CUSTOM_SITEMAP_URL):
+                if not state_store or await state_store.needs_crawl(entry):
+                    yield entry.loc
+
+    if not USE_CUSTOM_SITEMAP_ONLY:
+        async with AsyncSitemapCrawler(BASE_URL, paths=[MAIN_SITEMAP_URL]) as sitemap_crawler:
+            async for entry in sitemap_crawler.iter_sitemap_entries():
+                # Filter URLs to only include those from the Filipino section
+                if '/language/filipino/' not in entry.loc:
+                    continue
+                if not state_store or await state_store.needs_crawl(entry):
+                    yield entry.loc
 
 async def main():
+    state_store = None
+    journal = CrawlJournal(CRAWL_JOURNAL) if CRAWL_JOURNAL else None
     try:
-        urls = set()  # Use set to avoid duplicates
+        if STREAM_DISCOVERY:
+            if INCREMENTAL_CRAWL:
+                state_store = CrawlStateStore(CRAWL_STATE_DB)
+            # Discovery feeds a bounded, de-duplicated queue that the crawl drains
+            await crawl_sequential(stream_urls(discover_urls(state_store)),
+                                   state_store=state_store, journal=journal, config=JOB_CONFIG)
+            return 0
+
+        entries = {}  # Sitemap entries keyed by URL to avoid duplicates
         
         # Get URLs from custom sitemap if provided
         if CUSTOM_SITEMAP_URL:
@@ -30,20 +76,28 @@ async def main():
                 'Accept': 'text/html,application/xml,application/xhtml+xml',
                 'Accept-Language': 'en-US,en;q=0.9',
             })
-            custom_urls = sitemap_crawler.get_urls_from_sitemap(CUSTOM_SITEMAP_URL)
-            if custom_urls:
-                print(f"\nFound {len(custom_urls)} URLs in custom sitemap")
-                urls.update(custom_urls)
+            custom_entries = sitemap_crawler.get_entries_from_sitemap(CUSTOM_SITEMAP_URL)
+            if custom_entries:
+                print(f"\nFound {len(custom_entries)} URLs in custom sitemap")
+                entries.update((entry.loc, entry) for entry in custom_entries)
         
         # Get URLs from main sitemap if enabled
         if not USE_CUSTOM_SITEMAP_ONLY:
             sitemap_crawler = SitemapCrawler(BASE_URL, paths=[MAIN_SITEMAP_URL])
-            standard_urls = sitemap_crawler.get_sitemap_urls()
-            if standard_urls:
+            standard_entries = sitemap_crawler.get_sitemap_entries()
+            if standard_entries:
                 # Filter URLs to only include those from the Filipino section
-                filipino_urls = {url for url in standard_urls if '/language/filipino/' in url}
-                print(f"\nFound {len(filipino_urls)} Filipino URLs in standard sitemaps")
-                urls.update(filipino_urls)
+                filipino_entries = [entry for entry in standard_entries if '/language/filipino/' in entry.loc]
+                print(f"\nFound {len(filipino_entries)} Filipino URLs in standard sitemaps")
+                entries.update((entry.loc, entry) for entry in filipino_entries)
+        
+        # Skip pages that have not changed since they were last crawled
+        if INCREMENTAL_CRAWL and entries:
+            state_store = CrawlStateStore(CRAWL_STATE_DB)
+            changed = await state_store.filter_changed(entries.values())
+            print(f"\n{len(entries) - len(changed)} URLs unchanged since last crawl, skipping")
+            entries = {entry.loc: entry for entry in changed}
+        urls = list(entries)
         
         # Process combined URLs
         if urls:
@@ -57,13 +111,18 @@ async def main():
                     print("Operation cancelled by user")
                     return 0
             
-            await crawl_sequential(list(urls))
+            await crawl_sequential(urls, state_store=state_store, journal=journal, config=JOB_CONFIG)
         else:
             print("\nNo URLs found to crawl")
             
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
         return 1
+    finally:
+        if state_store:
+            state_store.close()
+        if journal:
+            journal.close()
     return 0
 
 if __name__ == "__main__":
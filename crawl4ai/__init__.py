@@ -3,9 +3,19 @@ crawl4ai - A web crawler for AI applications
 """
 
 from .core.crawler import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CrawlResult
-from .strategies.markdown import DefaultMarkdownGenerator
-from .crawlers.sequential import crawl_sequential
-from .crawlers.sitemap import SitemapCrawler
+from .core.cache import CacheMode, ResponseCache
+from .core.blobs import BlobStore
+from .core.frontier import CrawlFrontier
+from .strategies.markdown import DefaultMarkdownGenerator, MarkdownGenerationResult, MarkdownGenerationStrategy
+from .crawlers.sequential import CrawlJobConfig, crawl_sequential
+from .crawlers.sitemap import SitemapCrawler, SitemapEntry
+from .crawlers.async_sitemap import AsyncSitemapCrawler
+from .crawlers.incremental import CrawlStateStore
+from .crawlers.journal import CrawlJournal
+from .crawlers.pipeline import stream_urls, crawl_sitemap
+from .utils.seen import FingerprintSet, BloomFilter
+from .utils.simhash import SimHashIndex, simhash
+from .output import BatchWriter, MarkdownFileWriter, ShardWriter, iter_shard_records, WarcWriter, replay_warc
 
 __version__ = "0.1.0"
 
@@ -14,7 +24,30 @@ __all__ = [
     "BrowserConfig",
     "CrawlerRunConfig",
     "CrawlResult",
+    "CacheMode",
+    "ResponseCache",
+    "BlobStore",
+    "CrawlFrontier",
     "DefaultMarkdownGenerator",
+    "MarkdownGenerationResult",
+    "MarkdownGenerationStrategy",
     "crawl_sequential",
-    "SitemapCrawler"
+    "CrawlJobConfig",
+    "SitemapCrawler",
+    "SitemapEntry",
+    "AsyncSitemapCrawler",
+    "CrawlStateStore",
+    "CrawlJournal",
+    "stream_urls",
+    "crawl_sitemap",
+    "FingerprintSet",
+    "BloomFilter",
+    "SimHashIndex",
+    "simhash",
+    "BatchWriter",
+    "MarkdownFileWriter",
+    "ShardWriter",
+    "iter_shard_records",
+    "WarcWriter",
+    "replay_warc"
 ] 
\ No newline at end of file
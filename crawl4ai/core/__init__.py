@@ -1,8 +1,18 @@
 from .crawler import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CrawlResult
+from .cache import CacheMode, ResponseCache
+from .blobs import BlobStore, content_hash
+from .content import SkippedContentError
+from .frontier import CrawlFrontier
 
 __all__ = [
     "AsyncWebCrawler",
     "BrowserConfig", 
     "CrawlerRunConfig",
-    "CrawlResult"
+    "CrawlResult",
+    "CacheMode",
+    "ResponseCache",
+    "BlobStore",
+    "content_hash",
+    "SkippedContentError",
+    "CrawlFrontier"
 ] 
\ No newline at end of file
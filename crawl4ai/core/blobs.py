@@ -0,0 +1,76 @@
+import asyncio
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from pathlib import Path
+from typing import Optional
+
+def content_hash(body: bytes) -> str:
+    """Return the hex BLAKE2b-128 digest identifying a response body"""
+    return blake2b(body, digest_size=16).hexdigest()
+
+class BlobStore:
+    """Content-addressed store of response bodies.
+
+    Each distinct body is kept once, gzip-compressed, at
+    ``<directory>/<first two hex digits>/<hash>.gz``, so pages that serve
+    byte-identical content (print views, tag pages, paginated duplicates)
+    cost a single file. ``CrawlResult.content_hash`` is the key to read a
+    page's body back. Files are written to a temporary name and renamed,
+    so a crash never leaves a partial blob under its final name.
+    """
+
+    def __init__(self, directory: str = ".crawl4ai_blobs", compresslevel: int = 6):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compresslevel = compresslevel
+        self.stored = 0  # Bodies written by this store
+        self.duplicates = 0  # Bodies skipped because they were already stored
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl4ai-blobs")
+
+    def path(self, digest: str) -> Path:
+        """Where the blob for ``digest`` lives"""
+        return self.directory / digest[:2] / f"{digest}.gz"
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def put(self, body: bytes, digest: Optional[str] = None) -> str:
+        """Store ``body`` unless it is already present and return its hash.
+
+        Writes run one at a time on the store's thread, so concurrent
+        duplicates find the first copy on disk instead of writing it twice.
+        """
+        digest = digest or content_hash(body)
+        await self._run(self._put, digest, body)
+        return digest
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Return the body stored under ``digest``, if any"""
+        return await self._run(self._get, digest)
+
+    def close(self) -> None:
+        """Finish pending writes"""
+        self._executor.shutdown(wait=True)
+
+    def _put(self, digest: str, body: bytes) -> None:
+        path = self.path(digest)
+        if path.exists():
+            self.duplicates += 1
+            return
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(gzip.compress(body, compresslevel=self.compresslevel))
+        tmp.replace(path)
+        self.stored += 1
+
+    def _get(self, digest: str) -> Optional[bytes]:
+        try:
+            return gzip.decompress(self.path(digest).read_bytes())
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from ..utils.url import normalize_url
+
+class CacheMode(str, Enum):
+    """How a crawl run uses the on-disk response cache"""
+    ENABLED = "enabled"        # Read cached responses and store new ones
+    REVALIDATE = "revalidate"  # Like ENABLED, but check every cached page with a conditional GET
+    BYPASS = "bypass"          # Ignore the cache entirely
+    READ_ONLY = "read_only"    # Serve from cache but never store
+    WRITE_ONLY = "write_only"  # Always fetch, store the responses
+
+    @property
+    def reads(self) -> bool:
+        return self in (CacheMode.ENABLED, CacheMode.REVALIDATE, CacheMode.READ_ONLY)
+
+    @property
+    def writes(self) -> bool:
+        return self in (CacheMode.ENABLED, CacheMode.REVALIDATE, CacheMode.WRITE_ONLY)
+
+    @property
+    def always_revalidates(self) -> bool:
+        """Whether cached pages are checked with the server however fresh they are"""
+        return self is CacheMode.REVALIDATE
+
+class CachedResponse(BaseModel):
+    """A stored response together with the markdown generated from it"""
+    url: str
+    status_code: int = 200
+    headers: Dict[str, str] = {}
+    html: str = ""
+    markdown: str = ""
+    title: Optional[str] = None
+    metadata: Dict[str, str] = {}
+    links: List[str] = []
+    content_hash: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def is_fresh(self, ttl: Optional[float]) -> bool:
+        """Whether the entry is younger than ``ttl`` seconds (None never expires)"""
+        return ttl is None or time.time() - self.fetched_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers built from the stored ETag/Last-Modified"""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        conditional = {}
+        if headers.get("etag"):
+            conditional["If-None-Match"] = headers["etag"]
+        if headers.get("last-modified"):
+            conditional["If-Modified-Since"] = headers["last-modified"]
+        return conditional
+
+def cache_key(url: str) -> str:
+    """Normalise a URL into the key its response is cached under"""
+    return normalize_url(url)
+
+class ResponseCache:
+    """Persistent SQLite store of crawled responses keyed by normalised URL.
+
+    Database work runs on a single background thread so lookups and writes
+    of large pages never block the event loop.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            status_code INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            html TEXT NOT NULL,
+            markdown TEXT NOT NULL,
+            title TEXT,
+            metadata TEXT NOT NULL,
+            links TEXT NOT NULL,
+            content_hash TEXT,
+            fetched_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, cache_dir: str = ".crawl4ai_cache", filename: str = "responses.db"):
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path / filename
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl4ai-cache")
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for ``url``, if any"""
+        return await self._run(self._get, cache_key(url))
+
+    async def put(self, entry: CachedResponse) -> None:
+        """Store or replace the cached response for ``entry.url``"""
+        await self._run(self._put, entry)
+
+    def close(self) -> None:
+        """Finish pending writes and close the database"""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        row = self._conn.execute(
+            "SELECT url, status_code, headers, html, markdown, title, metadata, links, "
+            "content_hash, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        url, status_code, headers, html, markdown, title, metadata, links, digest, fetched_at = row
+        return CachedResponse(
+            url=url, status_code=status_code, headers=json.loads(headers),
+            html=html, markdown=markdown, title=title,
+            metadata=json.loads(metadata), links=json.loads(links),
+            content_hash=digest, fetched_at=fetched_at
+        )
+
+    def _put(self, entry: CachedResponse) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, url, status_code, headers, html, markdown, title, metadata, links, content_hash, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (cache_key(entry.url), entry.url, entry.status_code, json.dumps(entry.headers),
+             entry.html, entry.markdown, entry.title, json.dumps(entry.metadata),
+             json.dumps(entry.links), entry.content_hash, entry.fetched_at or time.time())
+        )
+        self._conn.commit()
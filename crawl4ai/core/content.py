@@ -0,0 +1,67 @@
+import re
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+
+CHUNK_SIZE = 64 * 1024
+
+# URL path extensions that never contain crawlable HTML
+BINARY_EXTENSIONS = {
+    ".pdf", ".zip", ".gz", ".tgz", ".rar", ".7z", ".exe", ".dmg", ".iso",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".svg", ".ico", ".tiff",
+    ".mp3", ".wav", ".ogg", ".m4a", ".flac",
+    ".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm", ".wmv",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+}
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+
+class SkippedContentError(Exception):
+    """Raised when a response is deliberately not downloaded or parsed"""
+
+def is_binary_url(url: str) -> bool:
+    """Guess from the URL path whether it points to a binary download"""
+    path = urlparse(url).path.lower()
+    dot = path.rfind(".")
+    return dot > path.rfind("/") and path[dot:] in BINARY_EXTENSIONS
+
+def check_content_type(response: aiohttp.ClientResponse, allowed: Iterable[str]) -> None:
+    """Reject a response whose Content-Type is not in ``allowed``.
+
+    Responses without a Content-Type are let through and decoded as text.
+    """
+    allowed = list(allowed)
+    content_type = response.headers.get("Content-Type")
+    if allowed and content_type and response.content_type not in allowed:
+        raise SkippedContentError(f"Skipped non-HTML content ({response.content_type})")
+
+async def read_body(response: aiohttp.ClientResponse, max_size: Optional[int]) -> bytes:
+    """Stream the response body, aborting once it exceeds ``max_size`` bytes"""
+    if max_size and response.content_length and response.content_length > max_size:
+        raise SkippedContentError(
+            f"Page too large ({response.content_length} bytes, limit {max_size})"
+        )
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        body.extend(chunk)
+        if max_size and len(body) > max_size:
+            raise SkippedContentError(f"Page exceeded size limit of {max_size} bytes")
+    return bytes(body)
+
+def header_charset(headers: Iterable[Tuple[str, str]]) -> Optional[str]:
+    """Return the charset named in the Content-Type of stored (name, value) headers"""
+    content_type = next((value for name, value in headers if name.lower() == "content-type"), "")
+    match = _HEADER_CHARSET.search(content_type)
+    return match.group(1) if match else None
+
+def decode_body(body: bytes, charset: Optional[str] = None) -> str:
+    """Decode a body using the header charset, a <meta> charset or UTF-8"""
+    if not charset:
+        match = _META_CHARSET.search(body[:4096])
+        if match:
+            charset = match.group(1).decode("ascii", "ignore")
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
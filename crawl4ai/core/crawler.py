@@ -1,53 +1,194 @@
 import re
+import time
+import asyncio
+import multiprocessing
 import aiohttp
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urljoin
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 # from bs4 import BeautifulSoup
 from pydantic import BaseModel
-from ..strategies.markdown import DefaultMarkdownGenerator
+from ..strategies.markdown import DefaultMarkdownGenerator, MarkdownGenerationResult
+from .scheduler import HostQueues, HostScheduler
+from .retry import backoff_delay, is_retryable, retry_after
+from .cache import CacheMode, CachedResponse, ResponseCache
+from .blobs import BlobStore, content_hash
+from .frontier import CrawlFrontier
+from .content import (SkippedContentError, check_content_type, decode_body, header_charset,
+                      is_binary_url, read_body)
+from ..utils.simhash import SimHashIndex, simhash
 
 class BrowserConfig(BaseModel):
     """Configuration for browser behavior"""
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     timeout: int = 30
     verify_ssl: bool = True
+    pool_size: int = 100  # Total simultaneous connections, 0 for unlimited
+    pool_size_per_host: int = 0  # 0 for no per-host connection limit
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: Optional[int] = 300  # Seconds, None to cache forever
+    use_dns_cache: bool = True
+
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Build a TCP connector with this config's pooling settings.
+
+        Must be called from within a running event loop. The connector can
+        be passed to several crawlers so they share one connection pool.
+        """
+        return aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=self.use_dns_cache
+        )
 
 class CrawlerRunConfig(BaseModel):
     """Configuration for crawler run"""
     max_retries: int = 3
-    delay_between_requests: float = 1.0
-    follow_links: bool = False
+    retry_base_delay: float = 1.0  # Backoff base in seconds, doubled per attempt
+    retry_max_delay: float = 60.0
+    delay_between_requests: float = 1.0  # Minimum spacing between requests to the same host
+    follow_links: bool = False  # arun_many also crawls links found on the pages
+    max_depth: Optional[int] = 3  # Link hops from the start URLs, None for unlimited
+    max_pages: Optional[int] = None  # Total pages per arun_many call when following links
+    same_domain: bool = True  # Only follow links to the hosts of the start URLs
+    include_patterns: List[str] = []  # Regexes; followed links must match one
+    exclude_patterns: List[str] = []  # Regexes; links matching any are not followed
+    use_canonical_urls: bool = False  # Treat a page's <link rel="canonical"> target as crawled
+    keep_raw_response: bool = False  # Attach status line, headers and body bytes (for WARC output)
+    max_concurrency: int = 10
+    max_requests_per_host: int = 2
+    url_lookahead: int = 1000  # URLs arun_many reads ahead so idle workers can pick other hosts
+    markdown_workers: int = 0  # 0 converts on the event loop
+    markdown_executor: str = "process"  # "process" (spawned; guard scripts with __main__) or "thread"
+    markdown_memo_size: int = 256  # Conversions remembered by body hash, 0 to disable
+    blob_dir: Optional[str] = None  # Store each distinct response body once in this directory
+    detect_near_duplicates: bool = False  # Flag pages whose markdown nearly matches an earlier page
+    near_duplicate_distance: int = 3  # Max differing SimHash bits (of 64, up to 6) for a near duplicate
+    keep_near_duplicate_urls: bool = False  # Report near_duplicate_of, at one URL string per distinct page
+    max_page_size: Optional[int] = 10 * 1024 * 1024  # Bytes, None for no limit
+    allowed_content_types: List[str] = [
+        "text/html", "application/xhtml+xml", "text/plain", "text/xml", "application/xml"
+    ]  # Empty list accepts any type
+    skip_binary_urls: bool = True  # Skip URLs with file extensions like .pdf or .mp4
+    cache_mode: CacheMode = CacheMode.BYPASS
+    cache_dir: str = ".crawl4ai_cache"
+    cache_ttl: Optional[float] = None  # Seconds before a cached page is refetched, None never
+    revalidate: bool = True  # Refetch stale cached pages with conditional GETs (always, with REVALIDATE)
+
+class RawResponse(BaseModel):
+    """An HTTP exchange as it went over the wire, for archiving.
+
+    ``body`` is the payload after transfer and content decoding, since
+    aiohttp decompresses it before it can be read.
+    """
+    method: str = "GET"
+    request_headers: List[Tuple[str, str]] = []
+    version: str = "1.1"
+    status: int
+    reason: str = ""
+    headers: List[Tuple[str, str]] = []  # In order, repeated headers kept
+    body: bytes = b""
+    fetched_at: float = 0.0  # time.time() when the response headers arrived
 
 class CrawlResult(BaseModel):
     """Result from a crawl operation"""
     markdown: str
+    url: str = ""
     html: str = ""
+    title: Optional[str] = None
+    metadata: Dict[str, str] = {}
+    links: List[str] = []  # Absolute URLs of the page's links
+    success: bool = True
+    status_code: Optional[int] = None
+    response_headers: Dict[str, str] = {}
+    error_message: Optional[str] = None
+    from_cache: bool = False
+    not_modified: bool = False  # Server answered 304; content comes from the cache
+    content_hash: Optional[str] = None  # BLAKE2b of the body, its key in a BlobStore
+    simhash: Optional[int] = None  # 64-bit SimHash of the markdown, with detect_near_duplicates
+    near_duplicate: bool = False  # An earlier page had nearly the same markdown
+    near_duplicate_of: Optional[str] = None  # That page's URL, with keep_near_duplicate_urls
+    raw_response: Optional[RawResponse] = None  # Set with CrawlerRunConfig.keep_raw_response
     
     def clean_markdown(self) -> str:
         """Clean up the markdown content by removing excessive whitespace"""
         cleaned = re.sub(r'\n\s*\n', '\n\n', self.markdown)
-        cleaned = '\n'.join(line.strip() for line in cleaned.splitlines())
+        # Keep leading indentation: it carries nested lists and code blocks
+        cleaned = '\n'.join(line.rstrip() for line in cleaned.splitlines())
         cleaned = cleaned.strip()
         return cleaned
 
+def _generate_markdown(generator, html: str, fingerprint: bool = False) -> MarkdownGenerationResult:
+    """Module-level entry point so process pools can pickle the call.
+
+    With ``fingerprint`` the markdown's SimHash is computed here too, off
+    the event loop when this runs in a worker pool.
+    """
+    generated = generator.generate_markdown(html)
+    if fingerprint:
+        generated.simhash = simhash(generated.markdown)
+    return generated
+
 class AsyncWebCrawler:
     """Asynchronous web crawler with session management"""
     
     def __init__(self, 
                  browser_config: BrowserConfig = None, 
                  run_config: CrawlerRunConfig = None,
-                 markdown_generator = None):
-        """Initialize the crawler with configuration"""
+                 markdown_generator = None,
+                 scheduler: HostScheduler = None,
+                 connector: aiohttp.BaseConnector = None,
+                 cache: ResponseCache = None,
+                 blob_store: BlobStore = None):
+        """Initialize the crawler with configuration.
+
+        Pass ``connector`` to share a connection pool between crawlers,
+        ``cache`` to share a response cache or ``blob_store`` to share a
+        body store; shared resources are left open when this crawler closes.
+        """
         self.session = None
+        self.connector = connector
+        self.cache = cache
+        self._owns_cache = False
+        self.blob_store = blob_store
+        self._owns_blob_store = False
+        # Body hash -> conversion, oldest first; shared by concurrent duplicates
+        self._markdown_memo: OrderedDict = OrderedDict()
+        self.executor: Optional[Executor] = None
         self.browser_config = browser_config or BrowserConfig()
         self.run_config = run_config or CrawlerRunConfig()
         self.markdown_generator = markdown_generator or DefaultMarkdownGenerator()
+        # Fingerprints of the distinct pages crawled so far
+        self.near_duplicates = SimHashIndex(self.run_config.near_duplicate_distance) \
+            if self.run_config.detect_near_duplicates else None
+        self._near_duplicate_urls: List[str] = []  # By index id, with keep_near_duplicate_urls
+        self.scheduler = scheduler or HostScheduler(
+            delay=self.run_config.delay_between_requests,
+            max_per_host=self.run_config.max_requests_per_host
+        )
         
     async def __aenter__(self):
         """Set up the aiohttp session when entering context"""
         if self.session is None:
+            shared = self.connector is not None
             self.session = aiohttp.ClientSession(
+                connector=self.connector if shared else self.browser_config.create_connector(),
+                connector_owner=not shared,
                 headers={"User-Agent": self.browser_config.user_agent},
                 timeout=aiohttp.ClientTimeout(total=self.browser_config.timeout)
             )
+        if self.executor is None and self.run_config.markdown_workers > 0:
+            self.executor = self._create_executor()
+        mode = self.run_config.cache_mode
+        if self.cache is None and (mode.reads or mode.writes):
+            self.cache = ResponseCache(self.run_config.cache_dir)
+            self._owns_cache = True
+        if self.blob_store is None and self.run_config.blob_dir:
+            self.blob_store = BlobStore(self.run_config.blob_dir)
+            self._owns_blob_store = True
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -55,18 +196,328 @@ class AsyncWebCrawler:
         if self.session:
             await self.session.close()
             self.session = None
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        if self._owns_cache:
+            self.cache.close()
+            self.cache = None
+            self._owns_cache = False
+        if self._owns_blob_store:
+            self.blob_store.close()
+            self.blob_store = None
+            self._owns_blob_store = False
+        self._markdown_memo.clear()
+
+    def _create_executor(self) -> Executor:
+        """Create the pool used to convert HTML off the event loop"""
+        workers = self.run_config.markdown_workers
+        kind = self.run_config.markdown_executor
+        if kind == "process":
+            # Workers start lazily, once the session, cache and writer threads
+            # are running; forking a threaded process can deadlock
+            return ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
+        if kind == "thread":
+            return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl4ai-markdown")
+        raise ValueError(f"Unknown markdown_executor '{kind}', expected 'process' or 'thread'")
+
+    async def _convert(self, html: str) -> MarkdownGenerationResult:
+        """Generate markdown, in the worker pool when one is configured"""
+        fingerprint = self.near_duplicates is not None
+        if self.executor is None:
+            return _generate_markdown(self.markdown_generator, html, fingerprint)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, _generate_markdown, self.markdown_generator, html, fingerprint
+        )
+
+    async def _convert_once(self, html: str, key: Tuple[str, Optional[str]]) -> MarkdownGenerationResult:
+        """Convert ``html``, reusing the result for bodies already converted.
+
+        ``key`` is the body hash and charset, which together determine the
+        decoded HTML. Concurrent requests for the same key wait on a single
+        conversion.
+        """
+        size = self.run_config.markdown_memo_size
+        if size <= 0:
+            return await self._convert(html)
+        memo = self._markdown_memo
+        conversion = memo.get(key)
+        if conversion is not None:
+            memo.move_to_end(key)
+        else:
+            conversion = asyncio.ensure_future(self._convert(html))
+            memo[key] = conversion
+            if len(memo) > size:
+                memo.popitem(last=False)
+        try:
+            # Shielded so one cancelled page does not cancel its duplicates
+            return await asyncio.shield(conversion)
+        except Exception:
+            if memo.get(key) is conversion:
+                del memo[key]
+            raise
             
     async def arun(self, url: str) -> CrawlResult:
         """Run the crawler on a single URL"""
         if self.session is None:
             raise RuntimeError("Crawler must be used within an async context manager")
 
+        mode = self.run_config.cache_mode
+        cached = result = None
+        if mode.reads and self.cache:
+            cached = await self.cache.get(url)
+            if cached and not mode.always_revalidates and cached.is_fresh(self.run_config.cache_ttl):
+                result = self._cached_result(url, await self._restore_html(cached), from_cache=True)
+            elif not (self.run_config.revalidate or mode.always_revalidates):
+                cached = None
+
+        if result is None:
+            result = await self._crawl(url, cached)
+            if result.success and mode.writes and self.cache:
+                # With a blob store the body is kept there once, not per URL
+                stored_html = "" if self.blob_store and result.content_hash else result.html
+                await self.cache.put(CachedResponse(
+                    url=url, status_code=200 if result.not_modified else result.status_code or 200,
+                    headers=result.response_headers, html=stored_html,
+                    markdown=result.markdown, title=result.title,
+                    metadata=result.metadata, links=result.links,
+                    content_hash=result.content_hash, fetched_at=time.time()
+                ))
+        if result.success and self.near_duplicates is not None:
+            await self._check_near_duplicate(result)
+        return result
+
+    async def _check_near_duplicate(self, result: CrawlResult) -> None:
+        """Flag a result if an earlier page had nearly identical markdown.
+
+        Only the first page of each group is indexed, so the index grows
+        with distinct pages. Fingerprints come from the conversion step;
+        cached pages are fingerprinted in the worker pool when there is one.
+        """
+        if result.simhash is None:
+            if self.executor is None:
+                result.simhash = simhash(result.markdown)
+            else:
+                loop = asyncio.get_running_loop()
+                result.simhash = await loop.run_in_executor(self.executor, simhash, result.markdown)
+        if not result.simhash:
+            return
+        match = self.near_duplicates.check(result.simhash)
+        if match is not None:
+            result.near_duplicate = True
+            if self.run_config.keep_near_duplicate_urls:
+                result.near_duplicate_of = self._near_duplicate_urls[match]
+        elif self.run_config.keep_near_duplicate_urls:
+            self._near_duplicate_urls.append(result.url)
+
+    async def _restore_html(self, cached: CachedResponse) -> CachedResponse:
+        """Fill in the html of an entry cached without it, from the blob store"""
+        if cached.html or not (self.blob_store and cached.content_hash):
+            return cached
+        body = await self.blob_store.get(cached.content_hash)
+        if body is None:
+            return cached
+        html = decode_body(body, header_charset(cached.headers.items()))
+        return cached.model_copy(update={"html": html})
+
+    def _cached_result(self, url: str, cached: CachedResponse, **fields) -> CrawlResult:
+        """Build a result from a cache entry"""
+        values = dict(
+            markdown=cached.markdown, html=cached.html, url=url,
+            title=cached.title, metadata=cached.metadata, links=cached.links,
+            status_code=cached.status_code, response_headers=cached.headers,
+            content_hash=cached.content_hash
+        )
+        values.update(fields)
+        return CrawlResult(**values)
+
+    async def _crawl(self, url: str, cached: Optional[CachedResponse] = None) -> CrawlResult:
+        """Fetch and convert a URL, retrying transient failures.
+
+        With a ``cached`` entry the request is conditional, and a 304 reply
+        reuses the cached content without converting it again. Bodies seen
+        before in this crawler reuse their earlier conversion, and with a
+        blob store each distinct body is stored once.
+        """
+        request_headers = cached.validators() if cached else {}
+        attempt = 0
+        while True:
+            try:
+                async with self.scheduler.slot(url):
+                    body, charset, status, headers, raw = await self._fetch(url, request_headers)
+                if status == 304 and cached:
+                    return self._cached_result(
+                        url, await self._restore_html(cached), status_code=304, not_modified=True,
+                        response_headers={**cached.headers, **headers}
+                    )
+                digest = content_hash(body)
+                if self.blob_store:
+                    await self.blob_store.put(body, digest)
+                html = decode_body(body, charset)
+                generated = await self._convert_once(html, (digest, charset))
+                return CrawlResult(
+                    markdown=generated.markdown, html=html, url=url, status_code=status,
+                    response_headers=headers, title=generated.title,
+                    metadata=generated.metadata,
+                    links=[urljoin(url, link) for link in generated.links],
+                    content_hash=digest, simhash=generated.simhash, raw_response=raw
+                )
+            except Exception as e:
+                delay = self._retry_delay(url, e, attempt)
+                if delay is None:
+                    print(f"Error crawling {url}: {str(e)}")
+                    return CrawlResult(
+                        markdown="", html="", url=url, success=False,
+                        status_code=getattr(e, "status", None),
+                        error_message=str(e) or type(e).__name__
+                    )
+                attempt += 1
+                print(f"Retrying {url} in {delay:.1f}s (attempt {attempt}/{self.run_config.max_retries}): {str(e)}")
+                # Sleep outside the host slot so other requests keep flowing
+                await asyncio.sleep(delay)
+
+    async def _fetch(self, url: str, headers: Optional[Dict[str, str]] = None
+                     ) -> Tuple[bytes, Optional[str], int, Dict[str, str], Optional[RawResponse]]:
+        """Perform a single GET and return the body, its charset, status and headers.
+
+        The body is streamed and the request abandoned as soon as it turns
+        out to be binary, of a disallowed type or over the size limit. The
+        raw exchange is returned too when ``keep_raw_response`` is set.
+        """
+        config = self.run_config
+        if config.skip_binary_urls and is_binary_url(url):
+            raise SkippedContentError("Skipped binary download")
+        async with self.session.get(url, headers=headers,
+                                    ssl=self.browser_config.verify_ssl) as response:
+            fetched_at = time.time()
+            response.raise_for_status()
+            if response.status == 304:
+                return b"", None, response.status, dict(response.headers), None
+            check_content_type(response, config.allowed_content_types)
+            body = await read_body(response, config.max_page_size)
+            raw = self._raw_response(response, body, fetched_at) if config.keep_raw_response else None
+            return body, response.charset, response.status, dict(response.headers), raw
+
+    @staticmethod
+    def _raw_response(response: aiohttp.ClientResponse, body: bytes, fetched_at: float) -> RawResponse:
+        """Capture the request and response as sent and received"""
+        request = response.request_info
+        return RawResponse(
+            method=request.method,
+            request_headers=list(request.headers.items()),
+            version=f"{response.version.major}.{response.version.minor}",
+            status=response.status,
+            reason=response.reason or "",
+            headers=[(k.decode("latin-1"), v.decode("latin-1")) for k, v in response.raw_headers],
+            body=body,
+            fetched_at=fetched_at
+        )
+
+    def _retry_delay(self, url: str, error: Exception, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying, or None to give up"""
+        if attempt >= self.run_config.max_retries or not is_retryable(error):
+            return None
+        delay = backoff_delay(attempt, self.run_config.retry_base_delay,
+                              self.run_config.retry_max_delay)
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, min(requested, self.run_config.retry_max_delay))
+            # Honour the server's request for every caller on this host
+            self.scheduler.defer(url, delay)
+        return delay
+
+    async def arun_many(self, urls: Union[Iterable[str], AsyncIterable[str]],
+                        max_concurrency: Optional[int] = None) -> AsyncIterator[CrawlResult]:
+        """Crawl many URLs concurrently, yielding results as they complete.
+
+        A fixed pool of workers shares the crawler's session, so at most
+        ``max_concurrency`` requests are in flight at any time. URLs are
+        read up to ``url_lookahead`` ahead into per-host queues, and a free
+        worker takes a URL whose host has an open slot, so a busy host does
+        not hold up the others. ``urls`` may be an async iterable, such as
+        a URL discovery stream, in which case it is consumed lazily.
+        Results arrive in completion order; use ``CrawlResult.url`` to
+        match them back to their input.
+
+        With ``follow_links`` set in the run config (or when ``urls`` is a
+        CrawlFrontier) links found on each page are queued for crawling too,
+        within the config's depth, page and domain limits.
+        """
+        if self.session is None:
+            raise RuntimeError("Crawler must be used within an async context manager")
+
+        concurrency = max_concurrency or self.run_config.max_concurrency
+        if concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        # Bounded, so a slow consumer holds back the workers instead of
+        # letting finished pages pile up in memory
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        done = object()
+
+        frontier = None
+        if isinstance(urls, CrawlFrontier):
+            frontier = urls
+        elif self.run_config.follow_links:
+            urls = frontier = CrawlFrontier.from_config(urls, self.run_config)
+
+        queue = HostQueues(self.scheduler, self.run_config.url_lookahead)
+
+        async def feed():
+            try:
+                if hasattr(urls, "__aiter__"):
+                    async for url in urls:
+                        await queue.put(url)
+                else:
+                    for url in urls:
+                        await queue.put(url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error reading URLs to crawl: {str(e)}")
+            finally:
+                queue.close()
+
+        async def worker():
+            while True:
+                url = await queue.get()
+                if url is None:
+                    break
+                try:
+                    result = await self.arun(url)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Error crawling {url}: {str(e)}")
+                    result = CrawlResult(markdown="", url=url, success=False,
+                                         error_message=str(e) or type(e).__name__)
+                finally:
+                    queue.release(url)
+                if frontier:
+                    # Always complete, or the frontier waits forever
+                    if result.success:
+                        frontier.complete(url, result.links, result.metadata.get("canonical"))
+                    else:
+                        frontier.complete(url)
+                await results.put(result)
+            # Not sent when cancelled: nobody is reading results by then
+            await results.put(done)
+
+        feeder = asyncio.create_task(feed())
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
         try:
-            async with self.session.get(url, ssl=self.browser_config.verify_ssl) as response:
-                response.raise_for_status()
-                html = await response.text()
-                markdown = self.markdown_generator.generate_markdown(html)
-                return CrawlResult(markdown=markdown, html=html)
-        except Exception as e:
-            print(f"Error crawling {url}: {str(e)}")
-            return CrawlResult(markdown="", html="") 
+            remaining = len(workers)
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # Stop outstanding fetches if the consumer exits early
+            for task in (feeder, *workers):
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+
@@ -0,0 +1,163 @@
+import asyncio
+import heapq
+import itertools
+import re
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from ..utils.seen import FingerprintSet
+from ..utils.url import normalize_url, url_key
+
+CRAWLABLE_SCHEMES = ("http", "https")
+
+class CrawlFrontier:
+    """Breadth-first queue of URLs for link-following crawls.
+
+    Seed URLs are crawled at depth 0. Each completed page offers its links
+    back to the frontier, which queues those that pass the filters at one
+    level deeper; shallower URLs are always handed out first. URLs are
+    normalized, and variants of one page (http/https, trailing slash,
+    tracking parameters) are crawled once. Iteration ends
+    once the seeds are exhausted, nothing is queued and no handed-out URL is
+    still being crawled, so workers must call ``complete`` for every URL
+    they receive. ``seen`` may be any set-like object with ``add`` and
+    ``in`` support; a new FingerprintSet is used by default. With
+    ``use_canonical`` the ``<link rel="canonical">`` target of each page
+    counts as seen, so duplicates that point to it are not fetched again.
+    """
+
+    def __init__(self, seeds: Union[Iterable[str], AsyncIterable[str]],
+                 max_depth: Optional[int] = 3,
+                 max_pages: Optional[int] = None,
+                 same_domain: bool = True,
+                 include_patterns: List[str] = None,
+                 exclude_patterns: List[str] = None,
+                 use_canonical: bool = False,
+                 seen=None):
+        if hasattr(seeds, "__aiter__"):
+            self._seeds = seeds.__aiter__()
+            self._async_seeds = True
+        else:
+            self._seeds = iter(seeds)
+            self._async_seeds = False
+        self._seeds_done = False
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.same_domain = same_domain
+        self.use_canonical = use_canonical
+        self._include = [re.compile(p) for p in include_patterns or []]
+        self._exclude = [re.compile(p) for p in exclude_patterns or []]
+        self.seen = FingerprintSet() if seen is None else seen
+        self.domains = set()
+        self._queue: List[Tuple[int, int, str]] = []
+        self._order = itertools.count()
+        self._depths: Dict[str, int] = {}  # Depth of each URL being crawled
+        self._changed = asyncio.Event()
+        self.scheduled = 0
+
+    @classmethod
+    def from_config(cls, seeds: Union[Iterable[str], AsyncIterable[str]], config,
+                    seen=None) -> "CrawlFrontier":
+        """Build a frontier from the link-following fields of a CrawlerRunConfig"""
+        return cls(
+            seeds, max_depth=config.max_depth, max_pages=config.max_pages,
+            same_domain=config.same_domain, include_patterns=config.include_patterns,
+            exclude_patterns=config.exclude_patterns,
+            use_canonical=config.use_canonical_urls, seen=seen
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of handed-out URLs that have not been completed yet"""
+        return len(self._depths)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        while True:
+            if self.max_pages is not None and self.scheduled >= self.max_pages:
+                raise StopAsyncIteration
+            if not self._seeds_done:
+                seed = await self._next_seed()
+                if seed is not None:
+                    url = self._normalize(seed)
+                    if url and self._mark_seen(url):
+                        self.domains.add(self._host(url))
+                        return self._hand_out(url, 0)
+                    continue
+            if self._queue:
+                depth, _, url = heapq.heappop(self._queue)
+                return self._hand_out(url, depth)
+            if not self._depths:
+                raise StopAsyncIteration
+            # Wait for an in-flight page to add links or finish
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def _next_seed(self) -> Optional[str]:
+        try:
+            if self._async_seeds:
+                return await self._seeds.__anext__()
+            return next(self._seeds)
+        except (StopIteration, StopAsyncIteration):
+            self._seeds_done = True
+            return None
+
+    def _hand_out(self, url: str, depth: int) -> str:
+        self._depths[url] = depth
+        self.scheduled += 1
+        return url
+
+    def complete(self, url: str, links: Iterable[str] = (),
+                 canonical: Optional[str] = None) -> int:
+        """Mark ``url`` as crawled and queue its eligible ``links``.
+
+        ``links`` must be absolute URLs; ``canonical`` is the page's
+        canonical link, if any. Returns how many links were queued.
+        """
+        depth = self._depths.pop(url, 0)
+        if canonical and self.use_canonical:
+            self._mark_seen(normalize_url(canonical, base=url))
+        added = 0
+        if self.max_depth is None or depth < self.max_depth:
+            for link in links:
+                if self.add(link, depth + 1):
+                    added += 1
+        self._changed.set()
+        return added
+
+    def add(self, url: str, depth: int = 1) -> bool:
+        """Queue a discovered URL if it passes the filters and is new"""
+        url = self._normalize(url)
+        if not url or not self.allows(url) or not self._mark_seen(url):
+            return False
+        heapq.heappush(self._queue, (depth, next(self._order), url))
+        self._changed.set()
+        return True
+
+    def allows(self, url: str) -> bool:
+        """Whether a discovered URL passes the domain and pattern filters"""
+        if self.same_domain and self._host(url) not in self.domains:
+            return False
+        if self._include and not any(p.search(url) for p in self._include):
+            return False
+        return not any(p.search(url) for p in self._exclude)
+
+    def _mark_seen(self, url: str) -> bool:
+        """Record ``url`` as seen; False if a variant of it already was"""
+        key = url_key(url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).hostname or ""
+
+    @staticmethod
+    def _normalize(url: str) -> Optional[str]:
+        url = normalize_url(url)
+        if urlsplit(url).scheme not in CRAWLABLE_SCHEMES:
+            return None
+        return url
@@ -0,0 +1,46 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+import aiohttp
+
+# Status codes worth retrying; everything else is treated as permanent
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def is_retryable(error: BaseException) -> bool:
+    """Classify a fetch failure as transient (worth retrying) or permanent"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (
+        aiohttp.ClientConnectionError,
+        aiohttp.ClientPayloadError,
+        asyncio.TimeoutError,
+    ))
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Return the server-requested delay carried by an HTTP error, if any"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        headers: Optional[Mapping[str, str]] = error.headers
+        if headers:
+            return parse_retry_after(headers.get("Retry-After"))
+    return None
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given (0-based) attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
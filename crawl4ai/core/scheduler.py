@@ -0,0 +1,154 @@
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+class _HostState:
+    """Per-host bookkeeping for the scheduler"""
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.next_start = 0.0
+
+class HostScheduler:
+    """Enforce per-host request spacing and concurrency caps.
+
+    Each host gets its own concurrency limit and a minimum delay between
+    request start times. Requests to different hosts never wait on each
+    other, so many domains can be crawled in parallel at full throughput.
+    """
+
+    def __init__(self, delay: float = 1.0, max_per_host: int = 2):
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1")
+        self.delay = max(0.0, delay)
+        self.max_per_host = max_per_host
+        self._hosts: Dict[str, _HostState] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the key requests are grouped under (scheme-less host:port)"""
+        return urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(self.max_per_host)
+            self._hosts[host] = state
+        return state
+
+    def wait_time(self, host: str) -> float:
+        """Seconds until the request spacing allows another request to ``host``"""
+        state = self._hosts.get(host)
+        if state is None:
+            return 0.0
+        return max(0.0, state.next_start - asyncio.get_running_loop().time())
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Push back the next allowed request to the URL's host"""
+        state = self._state(self.host_key(url))
+        loop = asyncio.get_running_loop()
+        state.next_start = max(state.next_start, loop.time() + seconds)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait until a request to ``url`` is allowed and hold a host slot"""
+        state = self._state(self.host_key(url))
+        async with state.semaphore:
+            loop = asyncio.get_running_loop()
+            # Reserve a start time before sleeping so that concurrent
+            # waiters for the same host queue up behind each other
+            now = loop.time()
+            start = max(now, state.next_start)
+            state.next_start = start + self.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+class HostQueues:
+    """URLs waiting to be crawled, grouped by host.
+
+    ``get`` hands out the oldest URL of a host that can start a request
+    now, one below its concurrency cap whose request spacing has elapsed,
+    taking hosts in turn. Free workers therefore move on to other hosts
+    instead of queueing behind a busy one. Up to ``max_queued`` URLs are
+    held; ``put`` waits while the buffer is full.
+    """
+
+    def __init__(self, scheduler: HostScheduler, max_queued: int = 1000):
+        if max_queued < 1:
+            raise ValueError("max_queued must be at least 1")
+        self.scheduler = scheduler
+        self.max_queued = max_queued
+        self._queues: "OrderedDict[str, Deque[str]]" = OrderedDict()
+        self._active: Dict[str, int] = {}  # URLs handed out and not yet released, per host
+        self._size = 0
+        self._closed = False
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _notify(self) -> None:
+        # Wake every waiter; each one re-checks what it is waiting for
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait(self, timeout: Optional[float] = None) -> None:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def put(self, url: str) -> None:
+        """Queue ``url``, waiting while ``max_queued`` URLs are already waiting"""
+        while self._size >= self.max_queued:
+            await self._wait()
+        self._queues.setdefault(self.scheduler.host_key(url), deque()).append(url)
+        self._size += 1
+        self._notify()
+
+    def close(self) -> None:
+        """Mark the end of the input; ``get`` returns None once drained"""
+        self._closed = True
+        self._notify()
+
+    def release(self, url: str) -> None:
+        """Report that the request for a URL from ``get`` has finished"""
+        host = self.scheduler.host_key(url)
+        self._active[host] -= 1
+        if not self._active[host]:
+            del self._active[host]
+        self._notify()
+
+    async def get(self) -> Optional[str]:
+        """Return a URL whose host can take a request now, or None when done"""
+        while True:
+            url, wait = self._pop_ready()
+            if url is not None:
+                return url
+            if self._closed and not self._size:
+                return None
+            await self._wait(wait)
+
+    def _pop_ready(self) -> Tuple[Optional[str], Optional[float]]:
+        """Take a URL from the first ready host, else return how long to wait"""
+        soonest = None
+        for host, queue in self._queues.items():
+            if self._active.get(host, 0) >= self.scheduler.max_per_host:
+                continue  # Woken by release()
+            wait = self.scheduler.wait_time(host)
+            if wait > 0:
+                soonest = wait if soonest is None else min(soonest, wait)
+                continue
+            url = queue.popleft()
+            if queue:
+                self._queues.move_to_end(host)
+            else:
+                del self._queues[host]
+            self._active[host] = self._active.get(host, 0) + 1
+            self._size -= 1
+            self._notify()  # Room for put()
+            return url, None
+        return None, soonest
@@ -1,7 +1,18 @@
-from .sequential import crawl_sequential
-from .sitemap import SitemapCrawler
+from .sequential import CrawlJobConfig, crawl_sequential
+from .sitemap import SitemapCrawler, SitemapEntry
+from .async_sitemap import AsyncSitemapCrawler
+from .incremental import CrawlStateStore
+from .journal import CrawlJournal
+from .pipeline import stream_urls, crawl_sitemap
 
 __all__ = [
     "crawl_sequential",
-    "SitemapCrawler"
+    "CrawlJobConfig",
+    "SitemapCrawler",
+    "SitemapEntry",
+    "AsyncSitemapCrawler",
+    "CrawlStateStore",
+    "CrawlJournal",
+    "stream_urls",
+    "crawl_sitemap"
 ] 
\ No newline at end of file
@@ -0,0 +1,195 @@
+import asyncio
+import zlib
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+import aiohttp
+from ..core.scheduler import HostScheduler
+from ..utils.seen import FingerprintSet
+from .sitemap import CHUNK_SIZE, BaseSitemapCrawler, SitemapEntry, SitemapStreamParser
+
+class AsyncSitemapCrawler(BaseSitemapCrawler):
+    """Asynchronous sitemap crawler built on aiohttp.
+
+    Child sitemaps of a sitemap index are fetched concurrently, with at most
+    ``max_concurrency`` downloads in flight, and parsed incrementally as
+    their bodies stream in. Pass ``session`` (for example
+    ``crawler.session`` of an open AsyncWebCrawler) to reuse its connection
+    pool and run discovery in the same event loop as the page crawl, and
+    ``scheduler`` to apply the same per-host politeness limits.
+    """
+
+    def __init__(self, base_url: str, paths: List[str] = None, headers: dict = None,
+                 session: aiohttp.ClientSession = None, max_concurrency: int = 8,
+                 scheduler: HostScheduler = None, timeout: int = 30):
+        super().__init__(base_url, paths, headers)
+        self.session = session
+        self._owns_session = False
+        self.scheduler = scheduler
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.max_concurrency = max_concurrency
+
+    async def __aenter__(self):
+        """Create a session unless one was shared with this crawler"""
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the session if this crawler created it"""
+        await self.close()
+
+    def _ensure_session(self) -> None:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=self.timeout)
+            self._owns_session = True
+
+    async def close(self) -> None:
+        """Close the session if this crawler created it"""
+        if self._owns_session and self.session:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
+
+    async def get_sitemap_urls(self) -> List[str]:
+        """Try different sitemap paths and collect all URLs."""
+        return list({url async for url in self.iter_sitemap_urls()})
+
+    async def iter_sitemap_urls(self) -> AsyncIterator[str]:
+        """Yield URLs from the first sitemap found, as they are parsed."""
+        async for entry in self.iter_sitemap_entries():
+            yield entry.loc
+
+    async def get_sitemap_entries(self) -> List[SitemapEntry]:
+        """Like get_sitemap_urls, but keeping lastmod, changefreq and priority."""
+        return list({entry.loc: entry async for entry in self.iter_sitemap_entries()}.values())
+
+    async def iter_sitemap_entries(self) -> AsyncIterator[SitemapEntry]:
+        """Yield entries from the first sitemap found, as they are parsed."""
+        self._ensure_session()
+        await self._add_robots_sitemaps()
+
+        for path in self.paths:
+            sitemap_url = urljoin(self.base_url, path)
+            found = False
+            async for entry in self.iter_entries_from_sitemap(sitemap_url):
+                found = True
+                yield entry
+            if found:
+                print(f"Successfully found sitemap at: {sitemap_url}")
+                return
+
+        print("No sitemaps found at any of the standard locations")
+
+    async def get_urls_from_sitemap(self, sitemap_url: str) -> set:
+        """Process a specific sitemap URL (or sitemap index) and return its URLs."""
+        return {url async for url in self.iter_urls_from_sitemap(sitemap_url)}
+
+    async def iter_urls_from_sitemap(self, sitemap_url: str) -> AsyncIterator[str]:
+        """Stream the URLs of a sitemap, following sitemap indexes."""
+        async for entry in self.iter_entries_from_sitemap(sitemap_url):
+            yield entry.loc
+
+    async def get_entries_from_sitemap(self, sitemap_url: str) -> List[SitemapEntry]:
+        """Like get_urls_from_sitemap, but keeping lastmod, changefreq and priority."""
+        return list({entry.loc: entry async for entry in self.iter_entries_from_sitemap(sitemap_url)}.values())
+
+    async def iter_entries_from_sitemap(self, sitemap_url: str,
+                                        buffer_size: int = 1000) -> AsyncIterator[SitemapEntry]:
+        """Stream the entries of a sitemap, following sitemap indexes.
+
+        Child sitemaps are downloaded and parsed concurrently; their entries are
+        merged through a queue of ``buffer_size`` entries, so slow consumers
+        pause the downloads instead of buffering whole sitemaps.
+        """
+        self._ensure_session()
+        self.found_urls = FingerprintSet()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        done = object()
+
+        async def produce():
+            try:
+                await self._stream_sitemap(sitemap_url, queue)
+            except Exception as e:
+                print(f"Error processing sitemap {sitemap_url}: {str(e)}")
+            await queue.put(done)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is done:
+                    break
+                yield entry
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _stream_sitemap(self, sitemap_url: str, queue: asyncio.Queue) -> None:
+        """Parse one sitemap into ``queue``, recursing into index children."""
+        children = []
+        try:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self._semaphore:
+                if self.scheduler:
+                    async with self.scheduler.slot(sitemap_url):
+                        await self._parse_response(sitemap_url, queue, children)
+                else:
+                    await self._parse_response(sitemap_url, queue, children)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 403:
+                print(f"Access forbidden to {sitemap_url}. The site may be blocking automated access.")
+            else:
+                print(f"Error accessing {sitemap_url}: {str(e)}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error accessing {sitemap_url}: {str(e) or type(e).__name__}")
+        except (ElementTree.ParseError, zlib.error, EOFError) as e:
+            print(f"Error processing sitemap {sitemap_url}: {str(e) or type(e).__name__}")
+
+        if children:
+            tasks = [asyncio.ensure_future(self._stream_sitemap(child, queue)) for child in children]
+            try:
+                # One broken child must not abandon its siblings mid-stream
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                # On teardown, stop siblings that may be blocked on a full queue
+                for task in tasks:
+                    task.cancel()
+            for child, result in zip(children, results):
+                if isinstance(result, Exception):
+                    print(f"Error processing sitemap {child}: {str(result) or type(result).__name__}")
+
+    async def _parse_response(self, sitemap_url: str, queue: asyncio.Queue,
+                              children: List[str]) -> None:
+        """Stream a response through the sitemap parser."""
+        async with self.session.get(sitemap_url, headers=self.headers,
+                                    timeout=self.timeout) as response:
+            response.raise_for_status()
+            parser = SitemapStreamParser()
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await self._dispatch(parser, parser.feed(chunk), queue, children)
+            await self._dispatch(parser, parser.close(), queue, children)
+
+    async def _dispatch(self, parser: SitemapStreamParser, entries: List[SitemapEntry],
+                        queue: asyncio.Queue, children: List[str]) -> None:
+        for entry in entries:
+            if parser.is_index:
+                children.append(entry.loc)
+            elif self._is_new_url(entry.loc):
+                await queue.put(entry)
+
+    async def _add_robots_sitemaps(self) -> None:
+        """Check robots.txt for Sitemap directives and add them to paths."""
+        robots_url = urljoin(self.base_url, "/robots.txt")
+        try:
+            async with self.session.get(robots_url, headers=self.headers,
+                                        timeout=self.timeout) as response:
+                response.raise_for_status()
+                body = await response.text(errors="replace")
+            rp = RobotFileParser()
+            rp.parse(body.splitlines())
+            self._add_sitemap_paths(rp.site_maps())
+        except Exception as e:
+            print(f"Note: Could not process robots.txt ({str(e)})")
@@ -0,0 +1,102 @@
+import asyncio
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional
+from ..utils.url import url_key
+from .sitemap import SitemapEntry
+
+def _to_utc(when: datetime) -> datetime:
+    """Make ``when`` aware in UTC; naive datetimes are taken to be UTC, like <lastmod>"""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+def _report_error(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        print(f"Error recording crawl state: {str(error)}")
+
+class CrawlStateStore:
+    """SQLite record of when each URL was last crawled successfully.
+
+    Used for incremental crawls: a sitemap entry only needs fetching when it
+    has never been crawled, has no <lastmod>, or was modified after the last
+    successful crawl. URLs are stored by ``url_key``, so variants of a page
+    (normalized or not, http or https) share one record.
+
+    Database work runs on a single background thread so the event loop
+    never waits on SQLite: lookups are awaited, while ``mark_crawled``
+    queues its write and returns at once. Writes and lookups run in the
+    order they were made, and ``close`` waits for queued writes.
+    """
+
+    def __init__(self, path: str = "output/crawl_state.db"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_state ("
+            "url TEXT PRIMARY KEY, last_crawled TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl4ai-state")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Finish queued writes and close the database"""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def last_crawled(self, url: str) -> Optional[datetime]:
+        """Return when ``url`` was last crawled successfully, if ever."""
+        return await self._run(self._last_crawled, url)
+
+    def mark_crawled(self, url: str, when: datetime = None) -> None:
+        """Queue a record of a successful crawl of ``url`` (now by default)."""
+        when = _to_utc(when) if when else datetime.now(timezone.utc)
+        self._executor.submit(self._mark_crawled, url, when).add_done_callback(_report_error)
+
+    async def needs_crawl(self, entry: SitemapEntry) -> bool:
+        """Whether a sitemap entry changed since it was last crawled."""
+        if entry.lastmod is None:
+            return True
+        return await self._run(self._needs_crawl, entry)
+
+    async def filter_changed(self, entries: Iterable[SitemapEntry]) -> List[SitemapEntry]:
+        """Return only the entries that need to be (re)crawled, checked in one pass."""
+        return await self._run(self._filter_changed, list(entries))
+
+    def _last_crawled(self, url: str) -> Optional[datetime]:
+        row = self._conn.execute(
+            "SELECT last_crawled FROM crawl_state WHERE url = ?", (url_key(url),)
+        ).fetchone()
+        return _to_utc(datetime.fromisoformat(row[0])) if row else None
+
+    def _mark_crawled(self, url: str, when: datetime) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO crawl_state (url, last_crawled) VALUES (?, ?)",
+            (url_key(url), when.isoformat())
+        )
+        self._conn.commit()
+
+    def _needs_crawl(self, entry: SitemapEntry) -> bool:
+        if entry.lastmod is None:
+            return True
+        last = self._last_crawled(entry.loc)
+        return last is None or entry.lastmod > last
+
+    def _filter_changed(self, entries: List[SitemapEntry]) -> List[SitemapEntry]:
+        return [entry for entry in entries if self._needs_crawl(entry)]
@@ -0,0 +1,157 @@
+import asyncio
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from ..utils.url import url_key
+
+DONE = "done"
+FAILED = "failed"
+
+def _report_error(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        print(f"Error writing crawl journal: {str(error)}")
+
+class CrawlJournal:
+    """Durable per-URL log of a crawl run, used to resume after a crash.
+
+    Each URL is recorded as done (with the file it was saved to) or failed
+    as soon as it is processed. When a run is interrupted, the next run with
+    the same journal skips the done URLs, retries the failed ones and keeps
+    the original run timestamp, so saved filenames stay consistent. Once a
+    run completes, ``finish`` marks it closed and the following run starts
+    a fresh journal. URLs are stored by ``url_key``, so variants of a page
+    share one entry.
+
+    SQLite work runs on a single background thread: ``mark_done``,
+    ``mark_failed`` and ``finish`` queue their write and return at once,
+    lookups are awaited, and everything runs in the order it was called.
+    ``close`` waits for queued writes.
+    """
+
+    def __init__(self, path: str = "output/crawl_journal.db"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_journal ("
+            "url TEXT PRIMARY KEY, status TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "output_file TEXT, error TEXT, updated_at TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_run (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl4ai-journal")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Finish queued writes and close the database"""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _submit(self, func, *args) -> None:
+        self._executor.submit(func, *args).add_done_callback(_report_error)
+
+    def _get_run(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM crawl_run WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_run(self, key: str, value: Optional[str]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO crawl_run (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    async def begin(self, timestamp: str) -> str:
+        """Start or resume a run and return the run's timestamp.
+
+        An unfinished run is resumed with its original timestamp; otherwise
+        the journal is cleared and ``timestamp`` recorded for the new run.
+        """
+        return await self._run(self._begin, timestamp)
+
+    def finish(self) -> None:
+        """Queue marking the current run as complete"""
+        self._submit(self._finish, datetime.now(timezone.utc).isoformat())
+
+    async def is_done(self, url: str) -> bool:
+        """Whether ``url`` was processed successfully in this run"""
+        return await self._run(self._is_done, url)
+
+    def mark_done(self, url: str, output_file: str = None) -> None:
+        """Queue a record of ``url`` as processed, and where its output was saved"""
+        self._submit(self._record, url, DONE, output_file, None,
+                     datetime.now(timezone.utc).isoformat())
+
+    def mark_failed(self, url: str, error: str = None) -> None:
+        """Queue a record of a failed attempt at ``url``; it is retried on resume"""
+        self._submit(self._record, url, FAILED, None, error,
+                     datetime.now(timezone.utc).isoformat())
+
+    async def counts(self) -> Dict[str, int]:
+        """Number of URLs per status"""
+        return await self._run(self._counts)
+
+    async def saved_count(self) -> int:
+        """Number of URLs whose output was saved to a file"""
+        return await self._run(self._saved_count)
+
+    def _begin(self, timestamp: str) -> str:
+        previous = self._get_run("timestamp")
+        if previous and self._get_run("finished") is None:
+            counts = self._counts()
+            print(f"Resuming crawl from {previous}: {counts.get(DONE, 0)} done, "
+                  f"{counts.get(FAILED, 0)} to retry")
+            return previous
+        self._conn.execute("DELETE FROM crawl_journal")
+        self._conn.execute("DELETE FROM crawl_run")
+        self._set_run("timestamp", timestamp)
+        self._conn.commit()
+        return timestamp
+
+    def _finish(self, when: str) -> None:
+        self._set_run("finished", when)
+        self._conn.commit()
+
+    def _is_done(self, url: str) -> bool:
+        row = self._conn.execute(
+            "SELECT status FROM crawl_journal WHERE url = ?", (url_key(url),)
+        ).fetchone()
+        return bool(row) and row[0] == DONE
+
+    def _record(self, url: str, status: str, output_file: Optional[str],
+                error: Optional[str], when: str) -> None:
+        self._conn.execute(
+            "INSERT INTO crawl_journal (url, status, attempts, output_file, error, updated_at) "
+            "VALUES (?, ?, 1, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET status = excluded.status, "
+            "attempts = attempts + 1, output_file = excluded.output_file, "
+            "error = excluded.error, updated_at = excluded.updated_at",
+            (url_key(url), status, output_file, error, when)
+        )
+        # Commit per URL so a crash loses at most the page in flight
+        self._conn.commit()
+
+    def _counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute(
+            "SELECT status, COUNT(*) FROM crawl_journal GROUP BY status"
+        ).fetchall())
+
+    def _saved_count(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM crawl_journal WHERE status = ? AND output_file IS NOT NULL",
+            (DONE,)
+        ).fetchone()[0]
@@ -0,0 +1,74 @@
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+from ..core.crawler import AsyncWebCrawler, CrawlResult
+from ..utils.seen import FingerprintSet
+from ..utils.url import normalize_url, url_key
+from .async_sitemap import AsyncSitemapCrawler
+
+async def stream_urls(source: Union[Iterable[str], AsyncIterable[str]],
+                      queue_size: int = 1000, seen=None) -> AsyncIterator[str]:
+    """Run URL discovery as a producer feeding a bounded queue.
+
+    ``source`` is consumed in a background task and each URL is normalized
+    and queued once; variants such as http/https, a trailing slash or
+    utm_* parameters count as the same URL. When ``queue_size`` URLs are waiting, discovery
+    pauses until consumers catch up, so fetch workers can start on the first
+    URLs while discovery is still running. ``seen`` may be any set-like
+    object with ``add`` and ``in`` support; a new FingerprintSet is used by
+    default.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    seen = FingerprintSet() if seen is None else seen
+    done = object()
+
+    async def offer(url: str) -> None:
+        key = url_key(url)
+        if key not in seen:
+            seen.add(key)
+            await queue.put(normalize_url(url))
+
+    async def produce():
+        try:
+            if hasattr(source, "__aiter__"):
+                async for url in source:
+                    await offer(url)
+            else:
+                for url in source:
+                    await offer(url)
+        except Exception as e:
+            print(f"Error during URL discovery: {str(e)}")
+        await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            url = await queue.get()
+            if url is done:
+                break
+            yield url
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+async def crawl_sitemap(crawler: AsyncWebCrawler, sitemap_crawler: AsyncSitemapCrawler,
+                        sitemap_url: str = None, queue_size: int = 1000,
+                        max_concurrency: Optional[int] = None) -> AsyncIterator[CrawlResult]:
+    """Discover URLs from sitemaps and crawl them as they are found.
+
+    With ``sitemap_url`` only that sitemap (or sitemap index) is read;
+    otherwise the sitemap crawler's robots.txt and default paths are tried.
+    Results are yielded in completion order.
+    """
+    if sitemap_url:
+        source = sitemap_crawler.iter_urls_from_sitemap(sitemap_url)
+    else:
+        source = sitemap_crawler.iter_sitemap_urls()
+    urls = stream_urls(source, queue_size=queue_size)
+    results = crawler.arun_many(urls, max_concurrency=max_concurrency)
+    try:
+        async for result in results:
+            yield result
+    finally:
+        # Stop the workers before the discovery they are reading from
+        await results.aclose()
+        await urls.aclose()
@@ -1,73 +1,216 @@
+import asyncio
+from contextlib import AsyncExitStack
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+from pydantic import BaseModel, Field
 from ..core.crawler import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
-from ..strategies.markdown import DefaultMarkdownGenerator
+from ..strategies.markdown import DefaultMarkdownGenerator, MarkdownGenerationStrategy
+from ..output.writer import BatchWriter, MarkdownFileWriter
+from ..output.shards import ShardWriter
+from ..output.warc import WarcWriter
 from ..utils.filename import generate_filename
+from .incremental import CrawlStateStore
+from .journal import CrawlJournal
 
-# Constants can be moved to a config file or environment variables
+# Defaults for CrawlJobConfig; pass a config to override them per job
 SAVE_MARKDOWN = True
 OUTPUT_FILE_PREFIX = "vaea"
 MAX_PAGES_TO_SAVE = None # None for unlimited
 
-async def crawl_sequential(urls: List[str]):
-    print("\n=== Sequential Crawling with Session Reuse ===")
-    
+class CrawlJobConfig(BaseModel):
+    """Output, limits and crawler settings for one crawl_sequential job"""
+    save_markdown: bool = SAVE_MARKDOWN
+    output_dir: str = "output"  # Files go to <output_dir>/<prefix>/
+    prefix: str = OUTPUT_FILE_PREFIX
+    max_pages_to_save: Optional[int] = MAX_PAGES_TO_SAVE  # The crawl stops once reached
+    concurrency: Optional[int] = None  # Pages fetched at once, None uses run_config.max_concurrency
+    output_format: str = "markdown"  # "markdown" (one .md file per page) or "jsonl" (shards)
+    shard_compression: str = "gzip"  # "gzip", "zstd" (needs zstandard) or "none"
+    max_shard_bytes: int = 128 * 1024 * 1024
+    save_warc: bool = False  # Also archive raw request/response pairs as .warc.gz
+    skip_near_duplicates: bool = False  # Don't save pages nearly identical to one already crawled
+    browser_config: BrowserConfig = Field(default_factory=BrowserConfig)
+    run_config: CrawlerRunConfig = Field(default_factory=CrawlerRunConfig)
+
+async def _iter_urls(urls: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
+def _create_writer(config: CrawlJobConfig, output_dir: Optional[Path]) -> BatchWriter:
+    """Create the output sink for a job's output format"""
+    if config.output_format == "markdown":
+        return MarkdownFileWriter()
+    if config.output_format == "jsonl":
+        return ShardWriter(output_dir or config.output_dir, prefix=config.prefix,
+                           compression=config.shard_compression,
+                           max_shard_bytes=config.max_shard_bytes)
+    raise ValueError(f"Unknown output_format '{config.output_format}', expected 'markdown' or 'jsonl'")
+
+def _record_saved(journal: Optional[CrawlJournal], state_store: Optional[CrawlStateStore],
+                  url: str, path: str, ok: bool) -> None:
+    """Report a written file; pages are only marked done or crawled once on disk"""
+    if ok:
+        print(f"  Saved to: {path}")
+        if journal:
+            journal.mark_done(url, path)
+        if state_store:
+            state_store.mark_crawled(url)
+    elif journal:
+        journal.mark_failed(url, f"Could not write {path}")
+
+async def crawl_sequential(urls: Union[Iterable[str], AsyncIterable[str]],
+                           state_store: CrawlStateStore = None,
+                           journal: CrawlJournal = None,
+                           config: CrawlJobConfig = None,
+                           markdown_generator: MarkdownGenerationStrategy = None) -> int:
+    """Crawl URLs with one shared session, saving markdown to the output directory.
+
+    Pages are fetched ``config.concurrency`` at a time (the run config's
+    per-host limits still apply) and the crawl stops as soon as
+    ``config.max_pages_to_save`` pages have been saved; unless links are
+    followed, no more pages are fetched than could still be saved. Files
+    are written in batches on a background thread so disk I/O does not
+    stall fetches.
+    Each call only uses its own ``config``, so several jobs can run in one
+    process. With ``config.skip_near_duplicates``, pages whose markdown
+    nearly matches an earlier page are crawled but not saved. Returns the
+    number of pages saved.
+
+    ``urls`` may be an async iterable such as ``stream_urls(...)``, in which
+    case crawling starts while URLs are still being discovered.
+    When ``state_store`` is given, every successfully crawled URL is recorded
+    in it, once its output is written, so later incremental runs can skip
+    unchanged pages.
+    With a ``journal``, progress is recorded per URL as it happens; rerunning
+    after an interruption skips the URLs already done, retries the failed
+    ones and keeps writing files under the interrupted run's timestamp.
+    """
+    config = config or CrawlJobConfig()
+    max_pages = config.max_pages_to_save
+    sharded = config.output_format == "jsonl"
+    print(f"\n=== Crawling '{config.prefix}' with Session Reuse ===")
+
     # Track number of pages saved
     pages_saved = 0
 
     # Create output directory if markdown saving is enabled
     output_dir = None
-    timestamp = None
-    if SAVE_MARKDOWN:
-
-         # Create main output directory
-        base_output_dir = Path("output")
-        base_output_dir.mkdir(exist_ok=True)
-        
-        # Create subdirectory using OUTPUT_FILE_PREFIX
-        output_dir = base_output_dir / OUTPUT_FILE_PREFIX
-        output_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    browser_config = BrowserConfig(
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        timeout=30,
-        verify_ssl=True
-    )
-
-    crawl_config = CrawlerRunConfig(
-        max_retries=3,
-        delay_between_requests=1.0,
-        follow_links=False
-    )
-
-    async with AsyncWebCrawler(
-        browser_config=browser_config,
-        run_config=crawl_config,
-        markdown_generator=DefaultMarkdownGenerator()
-    ) as crawler:
-        total = len(urls)
-        for index, url in enumerate(urls, 1):
-            try:
-                print(f"\nProcessing {index}/{total}: {url}")
-                result = await crawler.arun(url=url)
-                if result.markdown:
-                    cleaned_markdown = result.clean_markdown()
-                    print(f"✓ Successfully crawled ({len(cleaned_markdown)} chars)")
-                    
-                    # Save to markdown file if enabled and within limit
-                    if (SAVE_MARKDOWN and output_dir and timestamp and 
-                        (MAX_PAGES_TO_SAVE is None or pages_saved < MAX_PAGES_TO_SAVE)):
-                        filename = generate_filename(url, index, timestamp, OUTPUT_FILE_PREFIX)
-                        output_file = output_dir / filename
-                        output_file.write_text(cleaned_markdown)
-                        print(f"  Saved to: {output_file}")
-                        pages_saved += 1
-                        
-                        if MAX_PAGES_TO_SAVE and pages_saved >= MAX_PAGES_TO_SAVE:
-                            print(f"\nReached maximum number of pages to save ({MAX_PAGES_TO_SAVE})")
-                else:
-                    print("✗ Failed: No content retrieved")
-            except Exception as e:
-                print(f"✗ Error: {str(e)}") 
\ No newline at end of file
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if config.save_markdown:
+        # Create subdirectory using the job prefix
+        output_dir = Path(config.output_dir) / config.prefix
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    if journal:
+        timestamp = await journal.begin(timestamp)
+        pages_saved = await journal.saved_count()
+
+    total = f"/{len(urls)}" if hasattr(urls, "__len__") else ""
+    position = 0
+    # Without followed links every URL handed out comes back as one result,
+    # so new URLs can wait until a page could still be saved
+    gated = max_pages is not None and output_dir is not None and not config.run_config.follow_links
+    in_flight = 0  # URLs handed to the crawler whose result has not arrived
+    capacity = asyncio.Condition()
+
+    async def pending_urls() -> AsyncIterator[str]:
+        nonlocal position, in_flight
+        async for url in _iter_urls(urls):
+            position += 1
+            if journal and await journal.is_done(url):
+                print(f"\nSkipping {position}{total}: {url} (done in interrupted run)")
+                continue
+            if gated:
+                async with capacity:
+                    await capacity.wait_for(lambda: pages_saved + in_flight < max_pages)
+            in_flight += 1
+            yield url
+
+    run_config = config.run_config
+    if config.skip_near_duplicates:
+        run_config = run_config.model_copy(update={"detect_near_duplicates": True})
+    if config.save_warc:
+        run_config = run_config.model_copy(update={"keep_raw_response": True})
+
+    if max_pages is not None and pages_saved >= max_pages:
+        print(f"\nReached maximum number of pages to save ({max_pages})")
+    else:
+        async with AsyncExitStack() as stack:
+            crawler = await stack.enter_async_context(AsyncWebCrawler(
+                browser_config=config.browser_config,
+                run_config=run_config,
+                markdown_generator=markdown_generator or DefaultMarkdownGenerator()
+            ))
+            writer = await stack.enter_async_context(_create_writer(config, output_dir))
+            warc_writer = None
+            if config.save_warc:
+                warc_writer = await stack.enter_async_context(
+                    WarcWriter(Path(config.output_dir) / config.prefix, prefix=config.prefix))
+            pending = pending_urls()
+            results = crawler.arun_many(pending, max_concurrency=config.concurrency)
+            stack.push_async_callback(pending.aclose)
+            # Runs first: stops the workers before the session and writers close
+            stack.push_async_callback(results.aclose)
+            async for result in results:
+                url = result.url
+                in_flight -= 1
+                try:
+                    if warc_writer and result.raw_response:
+                        await warc_writer.write_result(result)
+                    if result.markdown:
+                        cleaned_markdown = result.clean_markdown()
+                        print(f"✓ Successfully crawled {url} ({len(cleaned_markdown)} chars)")
+
+                        if config.skip_near_duplicates and result.near_duplicate:
+                            print(f"  Not saved: near duplicate of {result.near_duplicate_of or 'an earlier page'}")
+                            if journal:
+                                journal.mark_done(url)
+                            if state_store:
+                                state_store.mark_crawled(url)
+                        elif output_dir:
+                            if sharded:
+                                output_file = output_dir
+                                written = await writer.write_result(result, markdown=cleaned_markdown)
+                            else:
+                                # Numbered in save order: followed links have no input
+                                # position, and a resumed run continues the numbering
+                                filename = generate_filename(url, pages_saved + 1, timestamp, config.prefix)
+                                output_file = output_dir / filename
+                                written = await writer.write_file(output_file, cleaned_markdown)
+                            written.add_done_callback(
+                                lambda f, url=url, path=str(output_file):
+                                    _record_saved(journal, state_store, url, path, f.result())
+                            )
+                            pages_saved += 1
+                        else:
+                            if journal:
+                                journal.mark_done(url)
+                            if state_store:
+                                state_store.mark_crawled(url)
+
+                        if max_pages is not None and pages_saved >= max_pages:
+                            # Leaving the loop cancels any fetches still in flight
+                            print(f"\nReached maximum number of pages to save ({max_pages})")
+                            break
+                    else:
+                        error = result.error_message or "No content retrieved"
+                        print(f"✗ Failed {url}: {error}")
+                        if journal:
+                            journal.mark_failed(url, error)
+                except Exception as e:
+                    print(f"✗ Error: {str(e)}")
+                    if journal:
+                        journal.mark_failed(url, str(e))
+                finally:
+                    if gated:
+                        async with capacity:
+                            capacity.notify()
+
+    if journal:
+        journal.finish()
+    return pages_saved
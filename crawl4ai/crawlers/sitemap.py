@@ -1,9 +1,14 @@
-from typing import List
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
 from xml.etree import ElementTree
+from pydantic import BaseModel
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 import time
+import zlib
 import requests
+from ..utils.seen import FingerprintSet
+from ..utils.url import url_key
 
 # Default sitemap paths to check
 DEFAULT_SITEMAP_PATHS = [
@@ -13,43 +18,199 @@ DEFAULT_SITEMAP_PATHS = [
     "/wp-sitemap.xml",        # WordPress format
 ]
 
-class SitemapCrawler:
-    """Crawler for extracting URLs from XML sitemaps"""
-    
+CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+
+class SitemapEntry(BaseModel):
+    """A <url> (or child <sitemap>) entry of a sitemap"""
+    loc: str
+    lastmod: Optional[datetime] = None
+    changefreq: Optional[str] = None
+    priority: Optional[float] = None
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime (as used by <lastmod>) into an aware UTC datetime."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def _parse_priority(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+class SitemapStreamParser:
+    """Incremental parser for sitemaps and sitemap indexes.
+
+    Feed it raw response chunks; gzip-compressed sitemaps (.xml.gz) are
+    detected from their magic bytes and decompressed on the fly. Each parsed
+    entry is cleared from the tree as soon as it is returned, so memory stays
+    flat however large the sitemap is.
+    """
+
+    def __init__(self):
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._decompressor = None
+        self._head = b""
+        self._sniffed = False
+        self._root: Optional[ElementTree.Element] = None
+        self.is_index = False
+
+    def feed(self, chunk: bytes) -> List[SitemapEntry]:
+        """Parse a chunk and return the entries it completed."""
+        if not self._sniffed:
+            self._head += chunk
+            if len(self._head) < len(GZIP_MAGIC):
+                return []
+            self._sniffed = True
+            chunk, self._head = self._head, b""
+            if chunk.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if not self._decompressor:
+            self._parser.feed(chunk)
+            return self._read_entries()
+
+        # Inflate in bounded pieces: gzip sitemaps can expand 30x or more
+        entries = []
+        while chunk:
+            self._parser.feed(self._decompressor.decompress(chunk, CHUNK_SIZE))
+            entries.extend(self._read_entries())
+            chunk = self._decompressor.unconsumed_tail
+        return entries
+
+    def close(self) -> List[SitemapEntry]:
+        """Finish parsing and return any remaining entries."""
+        if self._head:
+            self._sniffed = True
+            self._parser.feed(self._head)
+            self._head = b""
+        if self._decompressor:
+            self._parser.feed(self._decompressor.flush())
+        self._parser.close()
+        return self._read_entries()
+
+    def _read_entries(self) -> List[SitemapEntry]:
+        entries = []
+        for event, element in self._parser.read_events():
+            name = _local_name(element.tag)
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                    self.is_index = name == "sitemapindex"
+                continue
+            if name in ("url", "sitemap"):
+                fields = {_local_name(child.tag): (child.text or "").strip() for child in element}
+                if fields.get("loc"):
+                    entries.append(SitemapEntry(
+                        loc=fields["loc"],
+                        lastmod=parse_lastmod(fields.get("lastmod")),
+                        changefreq=fields.get("changefreq") or None,
+                        priority=_parse_priority(fields.get("priority"))
+                    ))
+                # Drop processed entries so the tree never grows
+                self._root.clear()
+        return entries
+
+class BaseSitemapCrawler:
+    """Configuration and XML handling shared by the sitemap crawlers"""
+
     def __init__(self, base_url: str, paths: List[str] = None, headers: dict = None):
         self.base_url = base_url.rstrip('/')
         self.paths = paths or DEFAULT_SITEMAP_PATHS.copy()
         self.namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        self.session = requests.Session()
-        
+
         # Set default headers if none provided
         self.headers = headers or {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xml,application/xhtml+xml',
             'Accept-Language': 'en-US,en;q=0.9',
         }
+        # URLs yielded by the current discovery run, used to skip repeats
+        self.found_urls = FingerprintSet()
+
+    def _add_sitemap_paths(self, sitemap_urls: List[str]) -> None:
+        """Add sitemap locations listed in robots.txt to the paths to try."""
+        if sitemap_urls:
+            print(f"Found {len(sitemap_urls)} sitemaps in robots.txt")
+            for sitemap in sitemap_urls:
+                # Convert absolute URLs to paths
+                if sitemap.startswith(self.base_url):
+                    path = urlparse(sitemap).path
+                else:
+                    path = sitemap
+
+                if path not in self.paths:
+                    self.paths.append(path)
+                    print(f"Added sitemap from robots.txt: {path}")
+
+    def _is_new_url(self, url: str) -> bool:
+        """Valid and not yet yielded in this discovery run."""
+        return self._is_valid_url(url) and self.found_urls.add(url_key(url))
+
+    def _is_valid_url(self, url: str) -> bool:
+        """Basic URL validation."""
+        try:
+            result = urlparse(url)
+            return all([result.scheme, result.netloc])
+        except Exception:
+            return False
+
+class SitemapCrawler(BaseSitemapCrawler):
+    """Crawler for extracting URLs from XML sitemaps"""
+
+    def __init__(self, base_url: str, paths: List[str] = None, headers: dict = None):
+        super().__init__(base_url, paths, headers)
+        self.session = requests.Session()
         self.session.headers.update(self.headers)
-        self.found_urls = set()
 
     def get_sitemap_urls(self) -> List[str]:
         """Try different sitemap paths and collect all URLs."""
+        return list(set(self.iter_sitemap_urls()))
+
+    def iter_sitemap_urls(self) -> Iterator[str]:
+        """Yield URLs from the first sitemap found, as they are parsed."""
+        return (entry.loc for entry in self.iter_sitemap_entries())
+
+    def get_sitemap_entries(self) -> List[SitemapEntry]:
+        """Like get_sitemap_urls, but keeping lastmod, changefreq and priority."""
+        return list({entry.loc: entry for entry in self.iter_sitemap_entries()}.values())
+
+    def iter_sitemap_entries(self) -> Iterator[SitemapEntry]:
+        """Yield entries from the first sitemap found, as they are parsed."""
+        self.found_urls = FingerprintSet()
+
         # First, try to get sitemaps from robots.txt
         self._add_robots_sitemaps()
-        
+
         # Then try all known paths
         for path in self.paths:
             sitemap_url = urljoin(self.base_url, path)
+            found = False
             try:
-                urls = self._process_sitemap(sitemap_url)
-                if urls:
-                    print(f"Successfully found sitemap at: {sitemap_url}")
-                    return list(urls)  # Convert set to list
+                for entry in self._iter_sitemap(sitemap_url):
+                    found = True
+                    yield entry
             except Exception as e:
                 print(f"Failed to process sitemap at {sitemap_url}: {str(e)}")
-        
-        if not self.found_urls:
-            print("No sitemaps found at any of the standard locations")
-        return list(self.found_urls)
+            if found:
+                print(f"Successfully found sitemap at: {sitemap_url}")
+                return
+
+        print("No sitemaps found at any of the standard locations")
 
     def _add_robots_sitemaps(self) -> None:
         """Check robots.txt for Sitemap directives and add them to paths."""
@@ -58,81 +219,72 @@ class SitemapCrawler:
             rp = RobotFileParser()
             rp.set_url(robots_url)
             rp.read()
-            
-            sitemap_urls = rp.site_maps()
-            
-            if sitemap_urls:
-                print(f"Found {len(sitemap_urls)} sitemaps in robots.txt")
-                for sitemap in sitemap_urls:
-                    # Convert absolute URLs to paths
-                    if sitemap.startswith(self.base_url):
-                        path = urlparse(sitemap).path
-                    else:
-                        path = sitemap
-                    
-                    if path not in self.paths:
-                        self.paths.append(path)
-                        print(f"Added sitemap from robots.txt: {path}")
-            
+
+            self._add_sitemap_paths(rp.site_maps())
         except Exception as e:
             print(f"Note: Could not process robots.txt ({str(e)})")
 
-    def _process_sitemap(self, sitemap_url: str) -> set:
-        """Process a sitemap or sitemap index file."""
+    def _iter_sitemap(self, sitemap_url: str, rate_limit: bool = True) -> Iterator[SitemapEntry]:
+        """Stream a sitemap or sitemap index, yielding page entries."""
+        children = []
         try:
-            time.sleep(2)  # Rate limiting
-            response = self.session.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            
-            if response.status_code == 403:
+            if rate_limit:
+                time.sleep(2)  # Rate limiting
+            with self.session.get(sitemap_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                parser = SitemapStreamParser()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    for entry in parser.feed(chunk):
+                        if parser.is_index:
+                            children.append(entry.loc)
+                        elif self._is_new_url(entry.loc):
+                            yield entry
+                for entry in parser.close():
+                    if parser.is_index:
+                        children.append(entry.loc)
+                    elif self._is_new_url(entry.loc):
+                        yield entry
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 403:
                 print(f"Access forbidden to {sitemap_url}. The site may be blocking automated access.")
-                return set()
-            
-            root = ElementTree.fromstring(response.content)
-            
-            # Check if this is a sitemap index
-            if 'sitemapindex' in root.tag:
-                return self._process_sitemap_index(root)
-            
-            # Regular sitemap
-            return self._extract_urls_from_sitemap(root)
+            else:
+                print(f"Error accessing {sitemap_url}: {str(e)}")
+            return
         except requests.exceptions.RequestException as e:
             print(f"Error accessing {sitemap_url}: {str(e)}")
-            return set()
+            return
 
-    def _process_sitemap_index(self, root: ElementTree.Element) -> set:
-        """Process a sitemap index file containing multiple sitemaps."""
-        urls = set()
-        for sitemap in root.findall('.//ns:loc', self.namespace):
+        # Sitemap index: process each child sitemap in turn
+        for child in children:
             try:
-                sub_urls = self._process_sitemap(sitemap.text)
-                urls.update(sub_urls)
+                yield from self._iter_sitemap(child, rate_limit)
             except Exception as e:
-                print(f"Error processing sub-sitemap {sitemap.text}: {str(e)}")
-        return urls
-
-    def _extract_urls_from_sitemap(self, root: ElementTree.Element) -> set:
-        """Extract URLs from a regular sitemap file."""
-        return {
-            loc.text for loc in root.findall('.//ns:loc', self.namespace)
-            if self._is_valid_url(loc.text)
-        }
-
-    def _is_valid_url(self, url: str) -> bool:
-        """Basic URL validation."""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except Exception:
-            return False
+                print(f"Error processing sub-sitemap {child}: {str(e)}")
 
     def get_urls_from_sitemap(self, sitemap_url: str) -> set:
         """Process a specific sitemap URL and return its URLs."""
+        urls = set()
         try:
-            response = self.session.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            root = ElementTree.fromstring(response.content)
-            return self._extract_urls_from_sitemap(root)
+            urls.update(self.iter_urls_from_sitemap(sitemap_url))
         except Exception as e:
             print(f"Error processing sitemap {sitemap_url}: {str(e)}")
-            return set() 
\ No newline at end of file
+        return urls
+
+    def iter_urls_from_sitemap(self, sitemap_url: str) -> Iterator[str]:
+        """Stream the URLs of a specific sitemap (or sitemap index)."""
+        return (entry.loc for entry in self.iter_entries_from_sitemap(sitemap_url))
+
+    def get_entries_from_sitemap(self, sitemap_url: str) -> List[SitemapEntry]:
+        """Like get_urls_from_sitemap, but keeping lastmod, changefreq and priority."""
+        entries = {}
+        try:
+            for entry in self.iter_entries_from_sitemap(sitemap_url):
+                entries[entry.loc] = entry
+        except Exception as e:
+            print(f"Error processing sitemap {sitemap_url}: {str(e)}")
+        return list(entries.values())
+
+    def iter_entries_from_sitemap(self, sitemap_url: str) -> Iterator[SitemapEntry]:
+        """Stream the entries of a specific sitemap (or sitemap index)."""
+        self.found_urls = FingerprintSet()
+        return self._iter_sitemap(sitemap_url, rate_limit=False)
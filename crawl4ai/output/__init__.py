@@ -0,0 +1,13 @@
+from .writer import BatchWriter, MarkdownFileWriter
+from .shards import ShardWriter, iter_shard_records
+from .warc import WarcWriter, iter_warc_records, replay_warc
+
+__all__ = [
+    "BatchWriter",
+    "MarkdownFileWriter",
+    "ShardWriter",
+    "iter_shard_records",
+    "WarcWriter",
+    "iter_warc_records",
+    "replay_warc"
+]
@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import io
+import json
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+from .writer import BatchWriter
+
+try:
+    import zstandard
+except ImportError:  # Optional: pip install zstandard
+    zstandard = None
+
+SHARD_EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", "none": ".jsonl"}
+PARTIAL_SUFFIX = ".part"  # Shards still being written (or left by a crash)
+
+def resolve_compression(compression: str) -> str:
+    """Return a usable shard compression, falling back to gzip without zstandard"""
+    if compression not in SHARD_EXTENSIONS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {list(SHARD_EXTENSIONS)}")
+    if compression == "zstd" and zstandard is None:
+        print("Warning: zstandard is not installed, writing gzip shards instead")
+        return "gzip"
+    return compression
+
+def result_record(result, markdown: Optional[str] = None) -> Dict[str, Any]:
+    """Build the JSON record stored for a CrawlResult"""
+    return {
+        "url": result.url,
+        "title": result.title,
+        "markdown": result.markdown if markdown is None else markdown,
+        "status_code": result.status_code,
+        "metadata": result.metadata,
+        "headers": result.response_headers,
+        "from_cache": result.from_cache,
+        "content_hash": result.content_hash,
+        "near_duplicate": result.near_duplicate,
+        "near_duplicate_of": result.near_duplicate_of,
+        "fetched_at": time.time(),
+    }
+
+class ShardWriter(BatchWriter):
+    """Writes crawl results as compressed JSON Lines shards on a background thread.
+
+    Records go to ``<prefix>-<timestamp>-<n>.jsonl.gz`` (or ``.zst`` / plain
+    ``.jsonl``) in ``directory``; a new shard is started once the current
+    one reaches ``max_shard_bytes`` on disk. Shards carry a ``.part``
+    suffix until they are complete, and each batch is flushed so a crash
+    loses at most the batch being written.
+    """
+
+    def __init__(self, directory: Union[str, Path], prefix: str = "crawl",
+                 compression: str = "gzip", max_shard_bytes: int = 128 * 1024 * 1024,
+                 queue_size: int = 256, batch_size: int = 64):
+        super().__init__(queue_size, batch_size)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.compression = resolve_compression(compression)
+        self.max_shard_bytes = max_shard_bytes
+        self.shards: List[Path] = []  # Completed shard files
+        self._timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._raw = None
+        self._stream = None
+        self._path: Optional[Path] = None
+
+    async def write_result(self, result, markdown: Optional[str] = None) -> asyncio.Future:
+        """Queue a CrawlResult; ``markdown`` overrides the stored markdown"""
+        return await self.write(result_record(result, markdown))
+
+    def _open_shard(self) -> None:
+        name = f"{self.prefix}-{self._timestamp}-{len(self.shards):05d}"
+        self._path = self.directory / (name + SHARD_EXTENSIONS[self.compression])
+        self._raw = open(str(self._path) + PARTIAL_SUFFIX, "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def _close_shard(self) -> None:
+        if self._stream is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+        Path(str(self._path) + PARTIAL_SUFFIX).replace(self._path)
+        self.shards.append(self._path)
+        self._stream = self._raw = self._path = None
+
+    def _write_item(self, record: Dict[str, Any]) -> None:
+        if self._stream is None:
+            self._open_shard()
+        self._stream.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def _flush(self) -> None:
+        if self._stream is None:
+            return
+        if self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self._stream.flush()
+        self._raw.flush()
+        if self._raw.tell() >= self.max_shard_bytes:
+            self._close_shard()
+
+    def _close(self) -> None:
+        self._close_shard()
+
+def is_shard_file(path: Path) -> bool:
+    """Whether ``path`` looks like a (possibly partial) JSONL shard"""
+    name = path.name
+    if name.endswith(PARTIAL_SUFFIX):
+        name = name[:-len(PARTIAL_SUFFIX)]
+    return name.endswith(tuple(SHARD_EXTENSIONS.values()))
+
+def _open_shard_text(path: Path):
+    name = path.name
+    if name.endswith(PARTIAL_SUFFIX):
+        name = name[:-len(PARTIAL_SUFFIX)]
+    if name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("Reading .zst shards requires zstandard (pip install zstandard)")
+        raw = open(path, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True),
+                                encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+def iter_shard_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Stream records from a shard file, or from every shard in a directory.
+
+    Shards are read in name order, one line at a time, so memory use does
+    not depend on shard size. Partial shards left by an interrupted crawl
+    are read up to their last complete record.
+    """
+    path = Path(path)
+    files = sorted(p for p in path.iterdir() if is_shard_file(p)) if path.is_dir() else [path]
+    for shard in files:
+        try:
+            with _open_shard_text(shard) as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"Warning: skipping truncated record in {shard.name}")
+        except (EOFError, zlib.error) as e:
+            print(f"Warning: shard {shard.name} is truncated ({str(e) or type(e).__name__})")
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                print(f"Warning: shard {shard.name} is truncated ({str(e)})")
+            else:
+                raise
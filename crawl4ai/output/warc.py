@@ -0,0 +1,219 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+from pydantic import BaseModel
+from ..core.blobs import content_hash
+from ..core.content import decode_body, header_charset
+from ..core.crawler import CrawlResult, RawResponse
+from ..strategies.markdown import DefaultMarkdownGenerator, MarkdownGenerationStrategy
+from .writer import BatchWriter
+
+WARC_VERSION = "WARC/1.1"
+CRLF = b"\r\n"
+
+# Headers describing the wire encoding of a body that aiohttp has already decoded
+_ENCODING_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+def _record_id() -> str:
+    return f"<urn:uuid:{uuid.uuid4()}>"
+
+def _warc_date(timestamp: Optional[float] = None) -> str:
+    when = datetime.fromtimestamp(timestamp, timezone.utc) if timestamp else datetime.now(timezone.utc)
+    return when.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _digest(data: bytes) -> str:
+    return "sha1:" + base64.b32encode(hashlib.sha1(data).digest()).decode("ascii")
+
+def _header_block(lines: List[Tuple[str, str]]) -> bytes:
+    return b"".join(f"{name}: {value}\r\n".encode("utf-8") for name, value in lines)
+
+def build_record(warc_type: str, block: bytes, headers: List[Tuple[str, str]]) -> bytes:
+    """Serialize one WARC record (header, block and trailing blank lines)"""
+    record_headers = [
+        ("WARC-Type", warc_type),
+        *headers,
+        ("WARC-Block-Digest", _digest(block)),
+        ("Content-Length", str(len(block))),
+    ]
+    return (WARC_VERSION.encode("ascii") + CRLF + _header_block(record_headers) + CRLF
+            + block + CRLF + CRLF)
+
+def http_request_block(url: str, raw: RawResponse) -> bytes:
+    """The HTTP request line and headers as sent"""
+    parts = urlsplit(url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = list(raw.request_headers)
+    if not any(name.lower() == "host" for name, _ in headers):
+        headers.insert(0, ("Host", parts.netloc))
+    line = f"{raw.method} {target} HTTP/{raw.version}\r\n".encode("latin-1")
+    return line + _header_block(headers) + CRLF
+
+def http_response_block(raw: RawResponse) -> bytes:
+    """The HTTP status line, headers and body.
+
+    The body was stored decoded, so encoding headers are replaced by a
+    Content-Length that matches it and replay tools read it as-is.
+    """
+    headers = [(n, v) for n, v in raw.headers if n.lower() not in _ENCODING_HEADERS]
+    headers.append(("Content-Length", str(len(raw.body))))
+    line = f"HTTP/{raw.version} {raw.status} {raw.reason}\r\n".encode("latin-1")
+    return line + _header_block(headers) + CRLF + raw.body
+
+class WarcWriter(BatchWriter):
+    """Writes raw crawl responses to WARC (ISO 28500) files on a background thread.
+
+    Each crawled page becomes a request/response record pair, and every
+    record is its own gzip member, so standard WARC tools can seek to and
+    read single records. Files are named ``<prefix>-<timestamp>-<n>.warc.gz``
+    and a new one is started every ``max_file_bytes``. Results need a
+    ``raw_response``: set ``CrawlerRunConfig.keep_raw_response``.
+    """
+
+    def __init__(self, directory: Union[str, Path], prefix: str = "crawl",
+                 max_file_bytes: int = 1024 * 1024 * 1024,
+                 queue_size: int = 256, batch_size: int = 64):
+        super().__init__(queue_size, batch_size)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_file_bytes = max_file_bytes
+        self.files: List[Path] = []  # Completed WARC files
+        self._timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._file = None
+        self._path: Optional[Path] = None
+
+    async def write_result(self, result: CrawlResult) -> asyncio.Future:
+        """Queue the request/response records of a result with a raw_response"""
+        if result.raw_response is None:
+            raise ValueError(f"No raw response for {result.url}; enable keep_raw_response")
+        return await self.write((result.url, result.raw_response))
+
+    def _open_file(self) -> None:
+        name = f"{self.prefix}-{self._timestamp}-{len(self.files):05d}.warc.gz"
+        self._path = self.directory / name
+        self._file = open(self._path, "wb")
+        info = ("software: crawl4ai\r\nformat: WARC File Format 1.1\r\n"
+                "conformsTo: http://iipc.github.io/warc-specifications/specifications/warc-format/warc-1.1/\r\n")
+        self._file.write(gzip.compress(build_record("warcinfo", info.encode("utf-8"), [
+            ("WARC-Date", _warc_date()),
+            ("WARC-Filename", name),
+            ("WARC-Record-ID", _record_id()),
+            ("Content-Type", "application/warc-fields"),
+        ])))
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self.files.append(self._path)
+            self._file = self._path = None
+
+    def _write_item(self, item: Tuple[str, RawResponse]) -> None:
+        url, raw = item
+        if self._file is None:
+            self._open_file()
+        # When the response was captured, not when it reached the writer
+        date = _warc_date(raw.fetched_at)
+        response_id = _record_id()
+        response = build_record("response", http_response_block(raw), [
+            ("WARC-Record-ID", response_id),
+            ("WARC-Date", date),
+            ("WARC-Target-URI", url),
+            ("WARC-Payload-Digest", _digest(raw.body)),
+            ("Content-Type", "application/http;msgtype=response"),
+        ])
+        request = build_record("request", http_request_block(url, raw), [
+            ("WARC-Record-ID", _record_id()),
+            ("WARC-Date", date),
+            ("WARC-Target-URI", url),
+            ("WARC-Concurrent-To", response_id),
+            ("Content-Type", "application/http;msgtype=request"),
+        ])
+        # One gzip member per record
+        self._file.write(gzip.compress(response) + gzip.compress(request))
+
+    def _flush(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self._file.tell() >= self.max_file_bytes:
+            self._close_file()
+
+    def _close(self) -> None:
+        self._close_file()
+
+class WarcRecord(BaseModel):
+    """A record read back from a WARC file"""
+    warc_type: str
+    target_uri: Optional[str] = None
+    headers: Dict[str, str] = {}
+    content: bytes = b""
+
+def iter_warc_records(path: Union[str, Path]) -> Iterator[WarcRecord]:
+    """Stream records from a WARC file (plain or gzip), or every WARC in a directory"""
+    path = Path(path)
+    files = sorted(p for p in path.iterdir() if p.name.endswith((".warc", ".warc.gz"))) \
+        if path.is_dir() else [path]
+    for warc in files:
+        opener = gzip.open if warc.name.endswith(".gz") else open
+        with opener(warc, "rb") as stream:
+            while True:
+                line = stream.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue  # Blank lines between records
+                if not line.startswith(b"WARC/"):
+                    raise ValueError(f"Invalid WARC record header in {warc.name}: {line[:40]!r}")
+                headers = {}
+                for header in iter(stream.readline, CRLF):
+                    if not header:
+                        break
+                    name, _, value = header.decode("utf-8").partition(":")
+                    headers[name.strip()] = value.strip()
+                content = stream.read(int(headers.get("Content-Length", 0)))
+                yield WarcRecord(
+                    warc_type=headers.get("WARC-Type", ""),
+                    target_uri=headers.get("WARC-Target-URI"),
+                    headers=headers,
+                    content=content
+                )
+
+def parse_http_response(block: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    """Split an HTTP response block into status, headers and body"""
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers.append((name.strip(), value.strip()))
+    return status, headers, body
+
+def replay_warc(path: Union[str, Path],
+                markdown_generator: MarkdownGenerationStrategy = None) -> Iterator[CrawlResult]:
+    """Rebuild crawl results from the responses in a WARC, without the network.
+
+    Each response is decoded and converted again with ``markdown_generator``
+    (a DefaultMarkdownGenerator by default), so a crawl can be re-processed
+    with new extraction settings.
+    """
+    generator = markdown_generator or DefaultMarkdownGenerator()
+    for record in iter_warc_records(path):
+        if record.warc_type != "response" or not record.target_uri:
+            continue
+        status, headers, body = parse_http_response(record.content)
+        header_map = {name: value for name, value in headers}
+        html = decode_body(body, header_charset(headers))
+        generated = generator.generate_markdown(html)
+        yield CrawlResult(
+            markdown=generated.markdown, url=record.target_uri, html=html,
+            title=generated.title, metadata=generated.metadata,
+            links=[urljoin(record.target_uri, link) for link in generated.links],
+            status_code=status, response_headers=header_map, content_hash=content_hash(body)
+        )
@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+class BatchWriter:
+    """Base class for output sinks that write on a background thread.
+
+    ``write`` queues an item and returns at once, so disk I/O never blocks
+    the event loop. A drain task collects whatever is queued (up to
+    ``batch_size`` items) and hands it to one writer thread in a single
+    call, so small writes are batched. When ``queue_size`` items are
+    waiting, ``write`` blocks until the disk catches up, which keeps memory
+    bounded on slow storage.
+
+    Subclasses implement ``_write_item`` and, optionally, ``_flush``; both
+    run on the writer thread.
+    """
+
+    def __init__(self, queue_size: int = 256, batch_size: int = 64):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start(self) -> None:
+        """Start the writer; must be called from within a running event loop"""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl4ai-writer")
+            self._task = asyncio.create_task(self._drain())
+
+    async def write(self, item: Any) -> asyncio.Future:
+        """Queue ``item`` for writing.
+
+        Returns a future that resolves to True once the item is written, or
+        False if writing it failed.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return future
+
+    async def close(self) -> None:
+        """Write everything still queued and stop the writer thread"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._executor.shutdown(wait=True)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._close)
+        self._task = self._queue = self._executor = None
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            entry = await self._queue.get()
+            batch = []
+            # Take whatever is already queued, stopping at the close marker
+            while entry is not None:
+                batch.append(entry)
+                if len(batch) >= self.batch_size or self._queue.empty():
+                    break
+                entry = self._queue.get_nowait()
+            else:
+                closing = True
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self._write_batch, items)
+            except Exception as e:
+                print(f"Error writing output batch: {str(e)}")
+                results = [False] * len(batch)
+            for (_, future), ok in zip(batch, results):
+                if not future.done():
+                    future.set_result(ok)
+
+    def _write_batch(self, items: List[Any]) -> List[bool]:
+        results = []
+        for item in items:
+            try:
+                self._write_item(item)
+                results.append(True)
+            except Exception as e:
+                print(f"Error writing output: {str(e)}")
+                results.append(False)
+        self._flush()
+        return results
+
+    def _write_item(self, item: Any) -> None:
+        raise NotImplementedError
+
+    def _flush(self) -> None:
+        """Called on the writer thread after each batch"""
+
+    def _close(self) -> None:
+        """Called on a worker thread once the writer has drained"""
+
+class MarkdownFileWriter(BatchWriter):
+    """Writes one markdown file per page on a background thread"""
+
+    def __init__(self, queue_size: int = 256, batch_size: int = 64, encoding: str = "utf-8"):
+        super().__init__(queue_size, batch_size)
+        self.encoding = encoding
+
+    async def write_file(self, path: Union[str, Path], text: str) -> asyncio.Future:
+        """Queue ``text`` to be written to ``path``"""
+        return await self.write((Path(path), text))
+
+    def _write_item(self, item: Tuple[Path, str]) -> None:
+        path, text = item
+        path.write_text(text, encoding=self.encoding)
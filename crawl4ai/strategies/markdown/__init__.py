@@ -1,3 +1,3 @@
-from .default import DefaultMarkdownGenerator
+from .default import DefaultMarkdownGenerator, MarkdownGenerationResult, MarkdownGenerationStrategy
 
-__all__ = ["DefaultMarkdownGenerator"] 
\ No newline at end of file
+__all__ = ["DefaultMarkdownGenerator", "MarkdownGenerationResult", "MarkdownGenerationStrategy"]
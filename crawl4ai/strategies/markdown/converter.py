@@ -0,0 +1,330 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import CData
+
+# Elements whose content never contributes to the markdown
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas",
+    "iframe", "object", "embed", "select", "input", "textarea",
+}
+
+# Elements rendered as paragraphs separated by blank lines
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "main", "nav",
+    "aside", "form", "figure", "figcaption", "address", "dl", "dt", "dd",
+    "fieldset", "details", "summary", "caption", "center", "body",
+}
+
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+EMPHASIS_TAGS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+
+# <meta name="..."> tags copied into the result metadata
+META_FIELDS = {"description", "keywords", "author"}
+
+_WHITESPACE = re.compile(r"\s+")
+_EXTRA_BLANK_LINES = re.compile(r"\n{3,}")
+_FENCED_BLOCK = re.compile(r"(^```\n.*?^```$)", re.DOTALL | re.MULTILINE)
+
+def _tidy_lines(markdown: str) -> str:
+    """Strip trailing spaces and collapse blank lines outside fenced code"""
+    parts = _FENCED_BLOCK.split(markdown)
+    for i in range(0, len(parts), 2):  # Odd parts are the code blocks
+        text = "\n".join(line.rstrip() for line in parts[i].split("\n"))
+        parts[i] = _EXTRA_BLANK_LINES.sub("\n\n", text)
+    return "".join(parts)
+
+class _Buffer:
+    """Output accumulator with a pending line-break count"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.pending = 0
+        self.last = ""
+        self.item_start = False  # Nothing written since the last list marker
+        self.lead_space = False  # Whitespace was dropped before the first text
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+class _Table:
+    """Rows of cell text collected while walking a <table>"""
+
+    def __init__(self):
+        self.rows: List[List[str]] = []
+
+    def render(self) -> str:
+        rows = [row for row in self.rows if any(row)]
+        if not rows:
+            return ""
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |",
+                 "|" + "|".join(["---"] * width) + "|"]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return "\n".join(lines)
+
+class MarkdownConverter:
+    """Convert a parsed HTML document to Markdown in a single tree walk.
+
+    The walk uses an explicit stack instead of recursion, so arbitrarily
+    deep DOMs cannot exhaust the Python call stack. Title, metadata and link
+    targets are collected during the same pass. A converter instance holds
+    per-document state; create one per page.
+    """
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.metadata: Dict[str, str] = {}
+        self.links: List[str] = []
+        self._buffers: List[_Buffer] = [_Buffer()]
+        self._lists: List[List[int]] = []  # [ordered, next number] per open list
+        self._tables: List[_Table] = []
+        self._inner_tables = 0  # Tables open inside a cell, flattened to text
+        self._pre_depth = 0
+        self._pre_start = False  # Just opened a <pre>; its leading newline is dropped
+
+    def convert(self, soup: BeautifulSoup) -> str:
+        """Walk ``soup`` and return its Markdown rendering"""
+        stack = [(soup, False)]
+        while stack:
+            node, closing = stack.pop()
+            if closing:
+                self._close(node)
+            elif isinstance(node, Tag):
+                if node.name in SKIP_TAGS:
+                    continue
+                self._open(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.contents))
+            elif type(node) is NavigableString or isinstance(node, CData):
+                self._text(str(node))
+
+        return _tidy_lines(self._buffers[0].text()).strip()
+
+    # Output primitives
+
+    def _write(self, text: str) -> None:
+        buf = self._buffers[-1]
+        if buf.pending and buf.parts:
+            text = "\n" * buf.pending + self._indent() + text
+        buf.pending = 0
+        if text:
+            buf.parts.append(text)
+            buf.last = text[-1]
+            buf.item_start = False
+
+    def _break(self, lines: int = 2) -> None:
+        buf = self._buffers[-1]
+        if not buf.item_start:
+            buf.pending = max(buf.pending, lines)
+
+    def _indent(self) -> str:
+        return "  " * len(self._lists)
+
+    def _push(self) -> None:
+        self._buffers.append(_Buffer())
+
+    def _pop_inline(self) -> str:
+        """Close a capture buffer and return its text on a single line"""
+        return _WHITESPACE.sub(" ", self._buffers.pop().text()).strip()
+
+    def _pop_inline_spaced(self) -> Tuple[bool, str, bool]:
+        """Like ``_pop_inline``, also reporting whitespace before and after the text"""
+        buf = self._buffers.pop()
+        raw = _WHITESPACE.sub(" ", buf.text())
+        text = raw.strip()
+        lead = buf.lead_space or raw.startswith(" ")
+        return lead, text, raw.endswith(" ") or (lead and not text)
+
+    def _text(self, text: str) -> None:
+        if self._pre_depth:
+            if self._pre_start:
+                # As in HTML, a newline right after <pre> is not content
+                if text.startswith("\r\n"):
+                    text = text[2:]
+                elif text.startswith("\n"):
+                    text = text[1:]
+                self._pre_start = False
+            self._write(text)
+            return
+        text = _WHITESPACE.sub(" ", text)
+        buf = self._buffers[-1]
+        if not buf.parts or buf.pending or buf.last in (" ", "\n"):
+            if not buf.parts and text[:1] == " ":
+                buf.lead_space = True
+            text = text.lstrip()
+        if text:
+            self._write(text)
+
+    def _write_spaced(self, lead: bool, text: str, trail: bool) -> None:
+        """Write inline markup, keeping the spaces that were around its text"""
+        if lead:
+            self._text(" ")
+        if text:
+            self._write(text)
+        if trail:
+            self._text(" ")
+
+    def _write_inline(self, marker: str) -> None:
+        """Close a capture and write its text wrapped in ``marker`` when non-empty"""
+        lead, text, trail = self._pop_inline_spaced()
+        self._write_spaced(lead, f"{marker}{text}{marker}" if text else "", trail)
+
+    # Element handlers
+
+    def _open(self, tag: Tag) -> None:
+        name = tag.name
+        self._pre_start = False
+        if name in BLOCK_TAGS:
+            self._break()
+        elif name in HEADING_TAGS or name in ("a", "title", "blockquote"):
+            self._push()
+        elif not self._pre_depth and (name in EMPHASIS_TAGS or name == "code"):
+            self._push()
+        elif name in ("ul", "ol"):
+            self._break(1 if self._lists else 2)
+            start = tag.get("start", "1")
+            self._lists.append([name == "ol", int(start) if str(start).isdigit() else 1])
+        elif name == "li":
+            self._open_list_item()
+        elif name == "pre":
+            self._break()
+            self._write("```\n")
+            self._pre_depth += 1
+            self._pre_start = True
+        elif name == "table":
+            if self._tables:
+                # A layout table inside a cell: Markdown cells hold one line
+                self._inner_tables += 1
+            else:
+                self._break()
+                self._tables.append(_Table())
+        elif name == "tr" and self._tables and not self._inner_tables:
+            self._tables[-1].rows.append([])
+        elif name in ("td", "th") and self._tables and not self._inner_tables:
+            self._push()
+        elif name == "br":
+            if self._pre_depth:
+                self._write("\n")
+            else:
+                self._break(1)
+        elif name == "hr":
+            self._break()
+            self._write("---")
+            self._break()
+        elif name == "img":
+            self._open_image(tag)
+        elif name == "meta":
+            self._open_meta(tag)
+        elif name == "link":
+            self._open_link_tag(tag)
+        elif name == "html" and tag.get("lang"):
+            self.metadata["language"] = tag["lang"].strip()
+
+    def _close(self, tag: Tag) -> None:
+        name = tag.name
+        if name in BLOCK_TAGS:
+            self._break()
+        elif name in HEADING_TAGS:
+            text = self._pop_inline()
+            if text:
+                self._break()
+                self._write("#" * HEADING_TAGS[name] + " " + text)
+                self._break()
+        elif name == "a":
+            self._close_link(tag)
+        elif name == "title":
+            text = self._pop_inline()
+            if self.title is None and text:
+                self.title = text
+        elif not self._pre_depth and name in EMPHASIS_TAGS:
+            self._write_inline(EMPHASIS_TAGS[name])
+        elif not self._pre_depth and name == "code":
+            self._write_inline("`")
+        elif name == "blockquote":
+            self._close_blockquote()
+        elif name in ("ul", "ol"):
+            self._lists.pop()
+            self._break(1 if self._lists else 2)
+        elif name == "pre":
+            self._pre_depth -= 1
+            buf = self._buffers[-1]
+            self._write("```" if buf.last == "\n" else "\n```")
+            self._break()
+        elif name in ("td", "th"):
+            if self._tables and not self._inner_tables:
+                text = self._pop_inline().replace("|", "\\|")
+                table = self._tables[-1]
+                if not table.rows:
+                    table.rows.append([])
+                table.rows[-1].append(text)
+            else:
+                # Inner or stray cells are plain text, kept apart by a space
+                self._text(" ")
+        elif name == "table" and self._inner_tables:
+            self._inner_tables -= 1
+            self._text(" ")
+        elif name == "table":
+            rendered = self._tables.pop().render()
+            if rendered:
+                self._break()
+                self._write(rendered)
+                self._break()
+
+    def _open_list_item(self) -> None:
+        marker = "- "
+        if self._lists:
+            current = self._lists[-1]
+            if current[0]:
+                marker = f"{current[1]}. "
+                current[1] += 1
+        buf = self._buffers[-1]
+        if not buf.parts:
+            newlines = 0
+        elif len(self._lists) > 1:
+            newlines = 1
+        else:
+            newlines = max(buf.pending, 1)
+        indent = "  " * max(len(self._lists) - 1, 0)
+        buf.parts.append("\n" * newlines + indent + marker)
+        buf.pending = 0
+        buf.last = " "
+        buf.item_start = True
+
+    def _open_image(self, tag: Tag) -> None:
+        src = tag.get("src")
+        if src and not src.startswith("data:"):
+            alt = _WHITESPACE.sub(" ", tag.get("alt", "")).strip()
+            self._write(f"![{alt}]({src})")
+
+    def _open_meta(self, tag: Tag) -> None:
+        name = (tag.get("name") or "").lower()
+        content = tag.get("content")
+        if name in META_FIELDS and content and name not in self.metadata:
+            self.metadata[name] = content.strip()
+
+    def _open_link_tag(self, tag: Tag) -> None:
+        rel = tag.get("rel") or []
+        if isinstance(rel, str):
+            rel = rel.split()
+        href = (tag.get("href") or "").strip()
+        if href and "canonical" in (r.lower() for r in rel):
+            self.metadata.setdefault("canonical", href)
+
+    def _close_link(self, tag: Tag) -> None:
+        lead, text, trail = self._pop_inline_spaced()
+        href = (tag.get("href") or "").strip()
+        if href and not href.startswith(("javascript:", "#")):
+            self.links.append(href)
+            if text:
+                text = f"[{text}]({href})"
+        self._write_spaced(lead, text, trail)
+
+    def _close_blockquote(self) -> None:
+        buf = self._buffers.pop()
+        text = _tidy_lines(buf.text()).strip()
+        if text:
+            self._break()
+            self._write("\n".join(f"> {line}".rstrip() for line in text.splitlines()))
+            self._break()
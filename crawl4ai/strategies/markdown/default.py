@@ -1,46 +1,72 @@
+from functools import lru_cache
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
+from .converter import MarkdownConverter
 
-class MarkdownGenerationStrategy(BaseModel):
-    """Base class for markdown generation strategies"""
+# Parser backends in order of preference for "auto". html5lib is
+# supported when requested explicitly but is slower than html.parser.
+FAST_PARSERS = ["lxml"]
+FALLBACK_PARSER = "html.parser"
+
+@lru_cache(maxsize=None)
+def resolve_parser(parser: str) -> str:
+    """Return an installed BeautifulSoup parser for the requested backend.
+
+    "auto" picks the fastest installed backend. Unknown or missing backends
+    fall back to the pure-Python "html.parser". Backends repair malformed
+    markup differently, so switching can change the markdown of such pages:
+    lxml moves a block inside an inline element out of it, so
+    ``<b><p>x</p></b>`` gives ``**x**`` with html.parser but ``x`` with lxml.
+    """
+    candidates = FAST_PARSERS if parser == "auto" else [parser]
+    for candidate in candidates:
+        if builder_registry.lookup(candidate) is not None:
+            return candidate
+    if parser not in ("auto", FALLBACK_PARSER):
+        print(f"Warning: HTML parser '{parser}' is not available, using '{FALLBACK_PARSER}'")
+    return FALLBACK_PARSER
+
+class MarkdownGenerationResult(BaseModel):
+    """Output of a markdown generation strategy for one page"""
+    markdown: str = ""
     title: Optional[str] = None
-    
-    def generate_markdown(self, html: str) -> str:
+    metadata: Dict[str, str] = {}
+    links: List[str] = []  # Link targets as written in the page
+    simhash: Optional[int] = None  # Set by the crawler when detecting near duplicates
+
+class MarkdownGenerationStrategy(BaseModel):
+    """Base class for markdown generation strategies.
+
+    Strategies must not keep per-page state: everything derived from a page
+    is returned in the result, so one instance can be shared by concurrent
+    tasks and worker pools.
+    """
+
+    def generate_markdown(self, html: str) -> MarkdownGenerationResult:
         raise NotImplementedError
 
 class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
-    """Default strategy for converting HTML to markdown"""
-    def generate_markdown(self, html: str) -> str:
+    """Default strategy for converting HTML to markdown.
+
+    Produces structural Markdown (headings, links, lists, emphasis, code,
+    blockquotes and tables) from a single walk of the parsed document.
+    """
+    # BeautifulSoup backend: "html.parser", "lxml", "html5lib" or "auto"
+    parser: str = FALLBACK_PARSER
+
+    def generate_markdown(self, html: str) -> MarkdownGenerationResult:
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract title with error handling
-            try:
-                title_tag = soup.find('title')
-                if title_tag:
-                    self.title = title_tag.get_text().strip()
-                    if len(self.title) == 0:
-                        self.title = None
-                else:
-                    self.title = None
-            except Exception as e:
-                print(f"Warning: Could not extract title: {str(e)}")
-                self.title = None
-            
-            # Remove script and style elements
-            for element in soup(['script', 'style']):
-                element.decompose()
-                
-            # Get text and clean up whitespace
-            text = soup.get_text()
-            
-            # Clean up the text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            return text
+            soup = BeautifulSoup(html, resolve_parser(self.parser))
+            converter = MarkdownConverter()
+            markdown = converter.convert(soup)
+            return MarkdownGenerationResult(
+                markdown=markdown,
+                title=converter.title,
+                metadata=converter.metadata,
+                links=converter.links
+            )
         except Exception as e:
             print(f"Error in markdown generation: {str(e)}")
-            return "" 
\ No newline at end of file
+            return MarkdownGenerationResult()
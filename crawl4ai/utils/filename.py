@@ -1,5 +1,6 @@
 from urllib.parse import urlparse
 from typing import Optional
+from .url import normalize_url
 
 def sanitize_filename(text: str) -> str:
     """Convert text to a valid filename."""
@@ -33,6 +34,9 @@ def get_path_suffix(url: str) -> Optional[str]:
 def generate_filename(url: str, index: int, timestamp: str, default_prefix: str) -> str:
     """Generate a safe filename from URL components."""
     try:
+        # Equivalent URLs (host case, default port, tracking params) share a name
+        url = normalize_url(url)
+
         # Get domain prefix (e.g., 'crawl4ai' from 'docs.crawl4ai.com')
         prefix = get_domain_prefix(url, default_prefix)
         
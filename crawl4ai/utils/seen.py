@@ -0,0 +1,145 @@
+import math
+from array import array
+from hashlib import blake2b
+
+def url_fingerprint(url: str) -> int:
+    """Return a 64-bit fingerprint of ``url``.
+
+    Two distinct URLs share a fingerprint with probability about 2**-64
+    per pair, so a set of a billion fingerprints is still unlikely to see
+    a single collision.
+    """
+    return int.from_bytes(blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+class FingerprintSet:
+    """Compact set of seen URLs storing only 64-bit fingerprints.
+
+    Fingerprints live in an open-addressing hash table backed by an
+    ``array('Q')``, so each URL costs 8 bytes per slot rather than a full
+    string object: 10 to 15 bytes per URL depending on how recently the
+    table grew, against well over 100 bytes for a ``set`` of URL strings.
+    Supports ``add``, ``in`` and ``len``; URLs cannot be listed back out.
+    """
+
+    MAX_LOAD = 0.8
+    GROWTH = 1.5
+    _EMPTY = 0
+
+    def __init__(self, capacity: int = 1024):
+        self._table = array("Q", bytes(8 * max(8, math.ceil(capacity / self.MAX_LOAD))))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, url: str) -> bool:
+        fp = url_fingerprint(url) or 1
+        table = self._table
+        size = len(table)
+        i = fp % size
+        while True:
+            slot = table[i]
+            if slot == fp:
+                return True
+            if slot == self._EMPTY:
+                return False
+            i += 1
+            if i == size:
+                i = 0
+
+    def add(self, url: str) -> bool:
+        """Add ``url``; return True if it was not already present"""
+        # 0 marks an empty slot, so fold the (vanishingly rare) zero print
+        added = self._insert(url_fingerprint(url) or 1)
+        if added and self._count > len(self._table) * self.MAX_LOAD:
+            self._grow()
+        return added
+
+    def update(self, urls) -> None:
+        for url in urls:
+            self.add(url)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the fingerprint table"""
+        return self._table.itemsize * len(self._table)
+
+    def _insert(self, fp: int) -> bool:
+        table = self._table
+        size = len(table)
+        i = fp % size
+        while True:
+            slot = table[i]
+            if slot == fp:
+                return False
+            if slot == self._EMPTY:
+                table[i] = fp
+                self._count += 1
+                return True
+            i += 1
+            if i == size:
+                i = 0
+
+    def _grow(self) -> None:
+        # Grow by 1.5x rather than doubling so a freshly grown table is
+        # still over half full, keeping the cost under 16 bytes per URL
+        old = self._table
+        self._table = array("Q", bytes(8 * int(len(old) * self.GROWTH)))
+        self._count = 0
+        for fp in old:
+            if fp != self._EMPTY:
+                self._insert(fp)
+
+class BloomFilter:
+    """Fixed-size probabilistic set of seen URLs.
+
+    Uses about 1.2 bytes per URL at a 1% false-positive rate, whatever the
+    URL length. A false positive makes an unseen URL look seen, so it is
+    skipped; there are no false negatives. Memory is allocated up front for
+    ``capacity`` URLs and the error rate climbs past it.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = max(bits, 64)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of URLs added (approximate: false positives are not counted)"""
+        return self._count
+
+    def _positions(self, url: str):
+        # Double hashing: derive all k bit positions from one 64-bit digest
+        fp = url_fingerprint(url)
+        h1, h2 = fp & 0xFFFFFFFF, (fp >> 32) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, url: str) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(url))
+
+    def add(self, url: str) -> bool:
+        """Add ``url``; return True if it was (probably) not already present"""
+        bits = self._bits
+        added = False
+        for p in self._positions(url):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def update(self, urls) -> None:
+        for url in urls:
+            self.add(url)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array"""
+        return len(self._bits)
@@ -0,0 +1,130 @@
+import re
+from array import array
+from collections import Counter
+from hashlib import blake2b
+from itertools import combinations
+from typing import List, Optional
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Feature hashes are summed bit-wise as 64 counters of _LANE bits packed
+# into one integer: _SPREAD[i][b] holds byte ``b`` at position ``i`` of a
+# hash with each bit moved to its own counter.
+_LANE = 32
+_LANE_MASK = (1 << _LANE) - 1
+
+def _spread_table(position: int) -> List[int]:
+    table = []
+    for byte in range(256):
+        value = 0
+        for bit in range(8):
+            if byte >> bit & 1:
+                value |= 1 << ((position * 8 + bit) * _LANE)
+        table.append(value)
+    return table
+
+_SPREAD = [_spread_table(position) for position in range(8)]
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """Return the 64-bit SimHash of ``text``.
+
+    Features are overlapping runs of ``shingle_size`` lowercased words, so
+    texts that differ in a few words (a timestamp, an ad slot) get
+    fingerprints a few bits apart while unrelated texts differ in about 32
+    bits. Returns 0 for text without words.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) > shingle_size:
+        features = {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    else:
+        features = {" ".join(words)} if words else set()
+    if not features:
+        return 0
+    # Tally each byte position of the hashes once, instead of looping over bits
+    digests = b"".join(blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                       for feature in features)
+    counts = 0
+    for position, table in enumerate(_SPREAD):
+        for byte, n in Counter(digests[position::8]).items():
+            counts += table[byte] * n
+    half = len(features) // 2
+    fingerprint = 0
+    for bit in range(64):
+        if (counts >> (bit * _LANE)) & _LANE_MASK > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of bits that differ between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+class SimHashIndex:
+    """Compact in-memory index for finding near-duplicate SimHash fingerprints.
+
+    Fingerprints are cut into ``max_distance + m`` bands. Two fingerprints
+    within ``max_distance`` bits agree exactly on at least ``m`` bands, so
+    one hash table per combination of ``m`` bands finds every candidate,
+    and a lookup only compares against entries sharing a table key. Keys
+    cover at least 16 bits and tables have 65536 buckets, so buckets stay
+    small and lookups cheap. Each entry costs 8 bytes for the fingerprint
+    plus 4 per table (4 tables at the default distance of 3, 28 at the
+    maximum of 6). Entries are identified by their insertion number; keep
+    a list alongside to map them back to URLs if needed.
+    """
+
+    BUCKET_BITS = 16
+    MAX_DISTANCE = 6
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance <= self.MAX_DISTANCE:
+            raise ValueError(f"max_distance must be between 0 and {self.MAX_DISTANCE}")
+        self.max_distance = max_distance
+        # Fewest bands per key that still gives keys of BUCKET_BITS or more
+        per_key = max(1, -(-max_distance * self.BUCKET_BITS // (64 - self.BUCKET_BITS)))
+        bands = max_distance + per_key
+        band_masks = []
+        shift = 0
+        for i in range(bands):
+            width = 64 // bands + (1 if i < 64 % bands else 0)
+            band_masks.append(((1 << width) - 1) << shift)
+            shift += width
+        self._masks = [sum(combo) for combo in combinations(band_masks, per_key)]
+        buckets = 1 << self.BUCKET_BITS
+        self._heads = [array("i", [-1]) * buckets for _ in self._masks]
+        self._next = [array("i") for _ in self._masks]  # Previous entry in the same bucket
+        self._fingerprints = array("Q")
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _bucket(self, fingerprint: int, mask: int) -> int:
+        # Multiplicative hashing spreads the masked bits over the top 16
+        return ((fingerprint & mask) * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> (64 - self.BUCKET_BITS)
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Return the id of an indexed fingerprint within ``max_distance`` bits, if any"""
+        fingerprints = self._fingerprints
+        for mask, heads, chain in zip(self._masks, self._heads, self._next):
+            entry = heads[self._bucket(fingerprint, mask)]
+            while entry >= 0:
+                if hamming_distance(fingerprint, fingerprints[entry]) <= self.max_distance:
+                    return entry
+                entry = chain[entry]
+        return None
+
+    def add(self, fingerprint: int) -> int:
+        """Index ``fingerprint`` and return its id (0 for the first, then 1, ...)"""
+        entry = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        for mask, heads, chain in zip(self._masks, self._heads, self._next):
+            bucket = self._bucket(fingerprint, mask)
+            chain.append(heads[bucket])
+            heads[bucket] = entry
+        return entry
+
+    def check(self, fingerprint: int) -> Optional[int]:
+        """Return the id of a near-duplicate, or index ``fingerprint`` if it has none"""
+        match = self.find(fingerprint)
+        if match is None:
+            self.add(fingerprint)
+        return match
@@ -0,0 +1,84 @@
+from typing import Optional
+from urllib.parse import unquote, urljoin, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = frozenset({
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "twclid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "ref_src",
+})
+TRACKING_PREFIXES = ("utm_",)
+
+def _is_tracking_param(pair: str) -> bool:
+    name = unquote(pair.split("=", 1)[0]).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def _remove_dot_segments(path: str) -> str:
+    if "." not in path:
+        return path
+    segments = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+    # Keep the trailing slash of paths ending in "/." or "/.."
+    if path.endswith(("/.", "/..")):
+        segments.append("")
+    return "/".join(segments)
+
+def normalize_url(url: str, base: Optional[str] = None, strip_tracking: bool = True) -> str:
+    """Return the canonical form of ``url`` used for de-duplication and cache keys.
+
+    Lowercases the scheme and host, drops default ports, the fragment and
+    "." / ".." path segments, removes tracking parameters such as utm_* and
+    sorts the remaining query parameters by name (repeated names keep their
+    order, since servers may read them as a list). Percent-encoding and trailing
+    slashes are left alone, since servers may treat them as distinct.
+    Relative URLs are resolved against ``base`` first.
+    """
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+
+    netloc = parts.netloc
+    if netloc:
+        userinfo, _, hostport = netloc.rpartition("@")
+        try:
+            port = parts.port
+        except ValueError:
+            port = None  # Invalid port: keep it as written
+        host = parts.hostname or ""
+        if ":" in host:
+            host = f"[{host}]"  # IPv6 literal
+        if port is not None and port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{port}"
+        elif port is None and hostport.rpartition("]")[2].count(":"):
+            host = hostport.lower()
+        netloc = f"{userinfo}@{host}" if userinfo else host
+
+    path = _remove_dot_segments(parts.path) or ("/" if netloc else "")
+
+    query = parts.query
+    if query:
+        pairs = [pair for pair in query.split("&") if pair]
+        if strip_tracking:
+            pairs = [pair for pair in pairs if not _is_tracking_param(pair)]
+        query = "&".join(sorted(pairs, key=lambda pair: pair.split("=", 1)[0]))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+def url_key(url: str, base: Optional[str] = None) -> str:
+    """Return a de-duplication key treating URL variants of one page as equal.
+
+    On top of ``normalize_url`` this ignores the scheme (http/https) and
+    a trailing slash on the path, so ``http://example.com/a/`` and
+    ``https://example.com/a`` share a key.
+    """
+    parts = urlsplit(normalize_url(url, base))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", parts.netloc, path, parts.query, ""))